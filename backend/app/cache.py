@@ -0,0 +1,383 @@
+# backend/app/cache.py
+
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+
+from .parser import NAME_EXTRACTION, PDF_MAX_CHARS, PDF_MAX_PAGES, SPACY_MODEL
+from .skills import get_taxonomy
+
+# Bump when parse_resume output changes so stale cache entries are ignored
+PARSER_VERSION = "3"
+
+PARSE_CACHE_SIZE = int(os.getenv("PARSE_CACHE_SIZE", 256))
+# Derived JD features (skills, role, multipliers, vector) kept in memory
+JD_CACHE_SIZE = int(os.getenv("JD_CACHE_SIZE", 512))
+# Optional directory for a persistent tier that survives restarts (unset = memory only)
+PARSE_CACHE_DIR = os.getenv("PARSE_CACHE_DIR")
+# Parsed resumes hold personal data: seconds before a file in that directory is deleted
+PARSE_CACHE_TTL_SECONDS = int(os.getenv("PARSE_CACHE_TTL_SECONDS", 7 * 24 * 3600))
+# Bytes of parsed resumes kept in that directory across all workers
+PARSE_CACHE_DISK_BYTES = int(os.getenv("PARSE_CACHE_DISK_BYTES", 256 * 1024 * 1024))
+
+# Rendered PDF reports: seconds until a download link expires
+REPORT_TTL_SECONDS = int(os.getenv("REPORT_TTL_SECONDS", 3600))
+# Bytes of reports held in this process's memory (least recently used go first)
+REPORT_MEMORY_BYTES = int(os.getenv("REPORT_MEMORY_BYTES", 64 * 1024 * 1024))
+# Directory shared by the workers on a node, so any of them can serve a
+# download (empty = memory only, downloads must hit the rendering worker)
+REPORT_STORE_DIR = os.getenv("REPORT_STORE_DIR", os.path.join(tempfile.gettempdir(), "resume-reports"))
+# Bytes of reports kept in that directory across all workers
+REPORT_DISK_BYTES = int(os.getenv("REPORT_DISK_BYTES", 512 * 1024 * 1024))
+
+
+class LRUCache:
+    """Small thread-safe LRU with hit/miss counters."""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key):
+        with self._lock:
+            return self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+def _sweep_directory(directory: Path, suffix: str, ttl: float, max_bytes: int,
+                     expiring: tuple[str, ...] = ()) -> int:
+    """Delete expired ``suffix`` (and ``expiring``) files and stale temp files,
+    then the least recently read ``suffix`` files over max_bytes.
+
+    Files expire ttl seconds after their mtime; reads bump atime. Returns the
+    bytes left.
+    """
+    now = time.time()
+    files = []
+    with os.scandir(directory) as entries:
+        for entry in entries:
+            try:
+                st = entry.stat()
+            except OSError:
+                continue  # removed by another worker meanwhile
+            stale_tmp = entry.name.endswith(".tmp") and st.st_mtime + 60 < now
+            expired = entry.name.endswith((suffix, *expiring)) and st.st_mtime + ttl <= now
+            if stale_tmp or expired:
+                Path(entry.path).unlink(missing_ok=True)
+            elif entry.name.endswith(suffix):
+                files.append((max(st.st_atime, st.st_mtime), st.st_size, entry.path))
+    total = sum(size for _, size, _ in files)
+    for _, size, path in sorted(files):
+        if total <= max_bytes:
+            break
+        Path(path).unlink(missing_ok=True)
+        total -= size
+    return total
+
+
+# Settings that change parse_resume output without a code change
+_PARSE_SETTINGS = hashlib.sha256(
+    json.dumps([PDF_MAX_PAGES, PDF_MAX_CHARS, NAME_EXTRACTION, SPACY_MODEL]).encode()
+).hexdigest()[:8]
+
+
+class ParseCache:
+    """parse_resume results keyed by SHA-256 of the uploaded bytes.
+
+    Memory LRU in front of an optional directory of JSON files. Files there
+    expire after the TTL, and the least recently read are deleted once the
+    directory exceeds its byte budget, as in ReportStore.
+    """
+
+    _SWEEP_INTERVAL = 60  # seconds between scans of the directory
+
+    def __init__(self, maxsize: int, directory: str | None = None,
+                 ttl: int = PARSE_CACHE_TTL_SECONDS, disk_bytes: int = PARSE_CACHE_DISK_BYTES):
+        self.memory = LRUCache(maxsize)
+        self.directory = Path(directory) if directory else None
+        self.ttl = ttl
+        self.disk_bytes = disk_bytes
+        self.disk_hits = 0
+        self._disk_estimate = 0  # bytes on disk as of the last sweep, plus our writes since
+        self._last_sweep = 0.0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(content: bytes) -> str:
+        # Skills depend on the taxonomy, and the text and name on the parse
+        # settings, so changing either invalidates entries
+        return (
+            f"{hashlib.sha256(content).hexdigest()}-v{PARSER_VERSION}-"
+            f"{get_taxonomy().version}-{_PARSE_SETTINGS}"
+        )
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        parsed = self.memory.get(key)
+        if parsed is not None or not self.directory:
+            return parsed
+        path = self._path(key)
+        try:
+            created = path.stat().st_mtime
+            if created + self.ttl <= time.time():
+                path.unlink(missing_ok=True)
+                return None
+            parsed = json.loads(path.read_text(encoding="utf-8"))
+            # atime marks recent use for the disk LRU; mtime keeps the creation time
+            os.utime(path, (time.time(), created))
+        except (OSError, ValueError):
+            return None
+        self.disk_hits += 1
+        self.memory.put(key, parsed)
+        return parsed
+
+    def put(self, key: str, parsed: dict):
+        self.memory.put(key, parsed)
+        if not self.directory:
+            return
+        # Write then rename so other workers never read a half-written file
+        path = self._path(key)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        data = json.dumps(parsed).encode("utf-8")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Parse cache write failed: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self._disk_estimate += len(data)
+        if self._disk_estimate > self.disk_bytes or time.time() - self._last_sweep > self._SWEEP_INTERVAL:
+            self.sweep()
+
+    def sweep(self):
+        """Delete expired files, then least recently read ones over the disk budget."""
+        if not self.directory:
+            return
+        self._last_sweep = time.time()
+        try:
+            self._disk_estimate = _sweep_directory(self.directory, ".json", self.ttl, self.disk_bytes)
+        except OSError as e:
+            print(f"Parse cache sweep failed: {e}")
+
+    def stats(self) -> dict:
+        stats = self.memory.stats()
+        stats["disk_hits"] = self.disk_hits
+        stats["disk_enabled"] = self.directory is not None
+        stats["disk_bytes"] = self._disk_estimate
+        stats["disk_max_bytes"] = self.disk_bytes
+        stats["ttl_seconds"] = self.ttl
+        return stats
+
+
+class ReportStore:
+    """Rendered reports by ID, with a TTL and byte budgets.
+
+    A memory LRU (bounded by total bytes) in front of a directory shared by
+    every worker on the node. Reports are written through to the directory,
+    so a download routed to another worker still finds them; files there
+    expire after the TTL, and the least recently read are deleted once the
+    directory exceeds its own byte budget.
+    """
+
+    _ID = re.compile(r"^[0-9a-f]{8,64}$")
+    _SWEEP_INTERVAL = 60  # seconds between scans of the shared directory
+
+    def __init__(self, ttl: int = REPORT_TTL_SECONDS, max_bytes: int = REPORT_MEMORY_BYTES,
+                 directory: str | None = REPORT_STORE_DIR, disk_bytes: int = REPORT_DISK_BYTES):
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.directory = Path(directory) if directory else None
+        self.disk_bytes = disk_bytes
+        self._data: OrderedDict[str, tuple[bytes, float]] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._disk_estimate = 0  # bytes on disk as of the last sweep, plus our writes since
+        self._last_sweep = 0.0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.directory:
+            self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, report_id: str) -> Path:
+        return self.directory / f"{report_id}.pdf"
+
+    def _remember(self, report_id: str, data: bytes, expires: float):
+        """Add to the memory tier; caller holds the lock."""
+        if len(data) > self.max_bytes:
+            return
+        old = self._data.pop(report_id, None)
+        if old is not None:
+            self._size -= len(old[0])
+        self._data[report_id] = (data, expires)
+        self._size += len(data)
+        while self._size > self.max_bytes:
+            _, (evicted, _) = self._data.popitem(last=False)
+            self._size -= len(evicted)
+            self.evictions += 1
+
+    def put(self, report_id: str, data: bytes):
+        if not self._ID.match(report_id):
+            raise ValueError(f"Invalid report id {report_id!r}")
+        with self._lock:
+            self._remember(report_id, data, time.time() + self.ttl)
+        if not self.directory:
+            return
+        # Write then rename so other workers never read a half-written file
+        path = self._path(report_id)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        try:
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"Report store write failed: {e}")
+            tmp.unlink(missing_ok=True)
+            return
+        self.clear_pending(report_id)
+        self._disk_estimate += len(data)
+        if self._disk_estimate > self.disk_bytes or time.time() - self._last_sweep > self._SWEEP_INTERVAL:
+            self.sweep()
+
+    def get(self, report_id: str) -> bytes | None:
+        if not self._ID.match(report_id):
+            return None
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(report_id)
+            if entry is not None:
+                if entry[1] > now:
+                    self._data.move_to_end(report_id)
+                    self.hits += 1
+                    return entry[0]
+                del self._data[report_id]
+                self._size -= len(entry[0])
+        if self.directory:
+            path = self._path(report_id)
+            try:
+                created = path.stat().st_mtime
+                if created + self.ttl > now:
+                    data = path.read_bytes()
+                    # atime marks recent use for the disk LRU; mtime keeps the creation time
+                    os.utime(path, (now, created))
+                    with self._lock:
+                        self.disk_hits += 1
+                        self._remember(report_id, data, created + self.ttl)
+                    return data
+                path.unlink(missing_ok=True)
+            except OSError:
+                pass
+        self.misses += 1
+        return None
+
+    def mark_pending(self, report_id: str):
+        """Tell other workers this report is being rendered (cleared by put)."""
+        if self.directory and self._ID.match(report_id):
+            try:
+                self._path(report_id).with_suffix(".pending").touch()
+            except OSError as e:
+                print(f"Report store write failed: {e}")
+
+    def clear_pending(self, report_id: str):
+        if self.directory and self._ID.match(report_id):
+            self._path(report_id).with_suffix(".pending").unlink(missing_ok=True)
+
+    def is_pending(self, report_id: str) -> bool:
+        if not self.directory or not self._ID.match(report_id):
+            return False
+        try:
+            return self._path(report_id).with_suffix(".pending").stat().st_mtime + self.ttl > time.time()
+        except OSError:
+            return False
+
+    def exists(self, report_id: str) -> bool:
+        """Whether get() would find the report, without reading it."""
+        if not self._ID.match(report_id):
+            return False
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(report_id)
+            if entry is not None and entry[1] > now:
+                return True
+        if not self.directory:
+            return False
+        try:
+            return self._path(report_id).stat().st_mtime + self.ttl > now
+        except OSError:
+            return False
+
+    def sweep(self):
+        """Delete expired files, then least recently read ones over the disk budget."""
+        if not self.directory:
+            return
+        self._last_sweep = time.time()
+        try:
+            self._disk_estimate = _sweep_directory(
+                self.directory, ".pdf", self.ttl, self.disk_bytes, expiring=(".pending",)
+            )
+        except OSError as e:
+            print(f"Report store sweep failed: {e}")
+
+    def stats(self) -> dict:
+        return {
+            "size": len(self._data),
+            "bytes": self._size,
+            "max_bytes": self.max_bytes,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "disk_enabled": self.directory is not None,
+            "disk_bytes": self._disk_estimate,
+            "disk_max_bytes": self.disk_bytes,
+        }
+
+
+parse_cache = ParseCache(PARSE_CACHE_SIZE, PARSE_CACHE_DIR)
+jd_cache = LRUCache(JD_CACHE_SIZE)
+report_store = ReportStore()
@@ -0,0 +1,113 @@
+# backend/app/dedupe.py
+
+import hashlib
+import json
+import os
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .minhash import MinHasher, lsh_keys
+from .models import Analysis, AnalysisBucket, AnalysisSignature
+from .scoring import SCORING_VERSION
+from .similarity import similarity_version, tokenize
+from .skills import get_taxonomy
+
+# Estimated Jaccard similarity (of both resume and JD) at which analyses collapse
+NEAR_DUP_THRESHOLD = float(os.getenv("NEAR_DUP_THRESHOLD", 0.9))
+# LSH bands; more bands catch less similar pairs but return more candidates
+LSH_BANDS = int(os.getenv("LSH_BANDS", 16))
+
+SHINGLE_SIZE = 3
+
+_hasher = MinHasher()
+
+
+def shingles(text: str) -> set[str]:
+    """Word n-grams; near-duplicate texts share most of them."""
+    terms = tokenize(text)
+    if len(terms) < SHINGLE_SIZE:
+        return set(terms)
+    return {" ".join(terms[i:i + SHINGLE_SIZE]) for i in range(len(terms) - SHINGLE_SIZE + 1)}
+
+
+def content_key(resume_text: str, jd_text: str) -> str:
+    """Exact identity of an analysis: both texts plus everything the score
+    depends on, since an exact repeat reuses the stored result."""
+    digest = hashlib.sha256()
+    for text in (resume_text, jd_text):
+        digest.update(hashlib.sha256(text.lower().encode()).digest())
+    return f"{digest.hexdigest()}-{get_taxonomy().version}-{similarity_version()}-s{SCORING_VERSION}"
+
+
+class Fingerprint:
+    """MinHash signatures and exact content key of one (resume, JD) analysis."""
+
+    def __init__(self, resume_text: str, jd_text: str):
+        self.resume_sig = _hasher.signature(shingles(resume_text))
+        self.jd_sig = _hasher.signature(shingles(jd_text))
+        self.content_key = content_key(resume_text, jd_text)
+
+    @property
+    def usable(self) -> bool:
+        return self.resume_sig is not None and self.jd_sig is not None
+
+    def buckets(self) -> list[str]:
+        return lsh_keys([self.resume_sig, self.jd_sig], LSH_BANDS)
+
+
+def _load_sig(blob: bytes) -> np.ndarray:
+    return np.frombuffer(blob, dtype=np.uint32)
+
+
+def find_duplicate(db: Session, user_id: int, fp: Fingerprint) -> AnalysisSignature | None:
+    """The user's earlier analysis that fp near-duplicates, if any.
+
+    Candidates come from shared LSH buckets (an indexed lookup, independent
+    of history size); each is confirmed by estimating both Jaccard scores.
+    """
+    if not fp.usable:
+        return None
+    exact = db.query(AnalysisSignature).filter(
+        AnalysisSignature.user_id == user_id, AnalysisSignature.content_key == fp.content_key
+    ).first()
+    if exact:
+        return exact
+
+    candidate_ids = {
+        row.analysis_id
+        for row in db.query(AnalysisBucket.analysis_id).filter(
+            AnalysisBucket.user_id == user_id, AnalysisBucket.bucket.in_(fp.buckets())
+        )
+    }
+    if not candidate_ids:
+        return None
+    best, best_sim = None, NEAR_DUP_THRESHOLD
+    for sig in db.query(AnalysisSignature).filter(AnalysisSignature.analysis_id.in_(candidate_ids)):
+        sim = min(
+            MinHasher.jaccard(fp.resume_sig, _load_sig(sig.resume_sig)),
+            MinHasher.jaccard(fp.jd_sig, _load_sig(sig.jd_sig)),
+        )
+        if sim >= best_sim:
+            best, best_sim = sig, sim
+    return best
+
+
+def record(db: Session, analysis: Analysis, fp: Fingerprint, result: dict, duplicate: AnalysisSignature | None):
+    """Store fingerprint and result for a new analysis, or re-point the
+    duplicate's sidecar rows at the updated content. Caller commits."""
+    if not fp.usable:
+        return
+    sig = duplicate or AnalysisSignature(analysis_id=analysis.id, user_id=analysis.user_id, duplicates=0)
+    if duplicate is not None:
+        sig.duplicates = (sig.duplicates or 0) + 1
+        db.query(AnalysisBucket).filter(AnalysisBucket.analysis_id == analysis.id).delete()
+    sig.resume_sig = fp.resume_sig.tobytes()
+    sig.jd_sig = fp.jd_sig.tobytes()
+    sig.content_key = fp.content_key
+    sig.result = json.dumps(result)
+    db.add(sig)
+    db.add_all(
+        AnalysisBucket(analysis_id=analysis.id, user_id=analysis.user_id, bucket=bucket)
+        for bucket in fp.buckets()
+    )
@@ -0,0 +1,252 @@
+# backend/app/jobindex.py
+
+import heapq
+import threading
+from dataclasses import replace
+
+import numpy as np
+
+from .parser import ResumeDocument
+from .scoring import JDFeatures, _breakdown, jd_features
+from .similarity import PAIR_IDF, TfidfEngine, get_idf_model, get_similarity_engine
+
+_EMPTY = np.zeros(0, dtype=np.int32)
+
+
+class _Job:
+    __slots__ = ("job_id", "title", "features", "term_ids", "weights", "sq_norm")
+
+    def __init__(self, job_id, title, features, term_ids, weights, sq_norm):
+        self.job_id = job_id
+        self.title = title
+        # For TF-IDF the JD vector is kept as arrays and features.prepared is
+        # dropped; other engines keep their prepared form there
+        self.features: JDFeatures = features
+        self.term_ids: np.ndarray = term_ids
+        self.weights: np.ndarray = weights
+        self.sq_norm: float = sq_norm
+
+
+class JobIndex:
+    """In-memory index of JDs for "best matching jobs" queries.
+
+    An inverted index (canonical skill -> JD rows) finds JDs that share at
+    least one skill with the resume. Candidates are visited in order of an
+    upper bound on their score (similarity taken as 1) and scored exactly
+    against precomputed JD term vectors until the bound drops below the
+    current k-th best, so most candidates are never scored.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Taxonomy the indexed skills were extracted with; see reset()
+        self.taxonomy_version: str | None = None
+        self._clear()
+
+    def _clear(self):
+        self._rows: dict = {}                        # job_id -> row
+        self._jobs: list[_Job | None] = []           # row -> job, None once removed
+        self._postings: dict[str, list[int]] = {}    # skill -> rows (removed rows included)
+        self._posting_arrays: dict[str, np.ndarray] = {}
+        self._vocab: dict[str, int] = {}             # term -> column of the JD vectors
+        # Per-row values used for the score bound; grown by doubling
+        self._n_skills = np.zeros(0)
+        self._quality = np.zeros(0)
+        self._len_mult = np.zeros(0)
+        self._alive = np.zeros(0, dtype=bool)
+        self._removed = 0
+
+    def reset(self, version: str) -> bool:
+        """Empty the index for re-filling under taxonomy ``version``.
+
+        JD skills extracted with an older taxonomy no longer match resume
+        skills, so the index is rebuilt rather than queried across versions.
+        False if the index is already on ``version`` (someone else reset it).
+        """
+        with self._lock:
+            if version == self.taxonomy_version:
+                return False
+            self._clear()
+            self.taxonomy_version = version
+            return True
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _column(self, term) -> int:
+        if not isinstance(term, str):
+            return term  # hashed vectors are keyed by bucket number already
+        return self._vocab.setdefault(term, len(self._vocab))
+
+    @staticmethod
+    def _weights(prepared) -> dict:
+        # Fitted tf-idf vector, or raw counts for the per-pair closed form
+        return prepared.vector if prepared.vector is not None else prepared.counts
+
+    def _vectorize(self, prepared):
+        """(ids, weights, squared norm) of a JD's TF-IDF prepared form as arrays."""
+        vec = self._weights(prepared)
+        ids = np.fromiter((self._column(t) for t in vec), dtype=np.int32, count=len(vec))
+        weights = np.fromiter(vec.values(), dtype=np.float32, count=len(vec))
+        return ids, weights, prepared.sq_norm
+
+    def _grow(self, size: int):
+        if size <= len(self._alive):
+            return
+        capacity = max(1024, 2 * len(self._alive), size)
+        for name in ("_n_skills", "_quality", "_len_mult", "_alive"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def add(self, job_id, text: str, title: str = "") -> bool:
+        """Index (or re-index) a JD. JDs with no recognised skills are skipped."""
+        features = jd_features(text)
+        if not features.skills:
+            self.remove(job_id)
+            return False
+
+        with self._lock:
+            # Drop the document and its cached views: at 100k JDs they would
+            # dominate memory. TF-IDF vectors are stored as compact arrays.
+            if isinstance(get_similarity_engine(), TfidfEngine):
+                ids, weights, sq_norm = self._vectorize(features.prepared)
+                features = replace(features, doc=None, prepared=None)
+            else:
+                ids, weights, sq_norm = _EMPTY, _EMPTY, 0.0
+                features = replace(features, doc=None)
+            self._remove_locked(job_id)
+            row = len(self._jobs)
+            self._jobs.append(_Job(job_id, title, features, ids, weights, sq_norm))
+            self._rows[job_id] = row
+            self._grow(row + 1)
+            self._n_skills[row] = len(features.skills)
+            self._quality[row] = features.quality_multiplier
+            self._len_mult[row] = features.len_mult
+            self._alive[row] = True
+            for skill in features.skills:
+                self._postings.setdefault(skill, []).append(row)
+                self._posting_arrays.pop(skill, None)
+        return True
+
+    def remove(self, job_id) -> bool:
+        with self._lock:
+            return self._remove_locked(job_id)
+
+    def _remove_locked(self, job_id) -> bool:
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return False
+        self._jobs[row] = None
+        self._alive[row] = False
+        self._removed += 1
+        if self._removed > 1024 and self._removed > len(self._rows):
+            self._compact()
+        return True
+
+    def _compact(self):
+        """Drop removed rows so postings stop carrying dead entries."""
+        jobs = [job for job in self._jobs if job is not None]
+        self._rows, self._jobs, self._postings, self._posting_arrays = {}, [], {}, {}
+        self._alive[:] = False
+        self._removed = 0
+        for row, job in enumerate(jobs):
+            self._jobs.append(job)
+            self._rows[job.job_id] = row
+            self._n_skills[row] = len(job.features.skills)
+            self._quality[row] = job.features.quality_multiplier
+            self._len_mult[row] = job.features.len_mult
+            self._alive[row] = True
+            for skill in job.features.skills:
+                self._postings.setdefault(skill, []).append(row)
+
+    def _posting(self, skill: str) -> np.ndarray | None:
+        arr = self._posting_arrays.get(skill)
+        if arr is None and skill in self._postings:
+            arr = self._posting_arrays[skill] = np.array(self._postings[skill], dtype=np.int64)
+        return arr
+
+    def query(
+        self,
+        resume: ResumeDocument | str,
+        top_k: int = 10,
+        resume_skills: list[str] | None = None,
+    ) -> list[tuple[object, str, dict]]:
+        """Top-k JDs for a resume as (job_id, title, breakdown), best first.
+
+        Breakdowns are in compute_score's format; only JDs sharing at least
+        one skill with the resume are considered.
+        """
+        doc = ResumeDocument.of(resume)
+        skills = set(s.lower() for s in resume_skills or []) or set(doc.skills)
+        engine = get_similarity_engine()
+        rep = engine.represent(doc)
+        tfidf = isinstance(engine, TfidfEngine)
+
+        with self._lock:
+            postings = [p for p in map(self._posting, skills) if p is not None]
+            if not postings or top_k <= 0:
+                return []
+            n = len(self._jobs)
+            overlap = np.bincount(np.concatenate(postings), minlength=n)[:n]
+            candidates = np.flatnonzero((overlap > 0) & self._alive[:n])
+            skill_part = overlap[candidates] / self._n_skills[candidates] * 75.0 * self._quality[candidates]
+            bound = skill_part + 25.0 * self._len_mult[candidates]
+            order = np.argsort(-bound, kind="stable")
+            jobs = self._jobs
+            if tfidf:
+                # Resume vector in the JD vectors' column space
+                vec = self._weights(rep)
+                model = get_idf_model()
+                hashed = rep.vector is not None and model.hashing
+                columns = vec if hashed else {self._vocab[t]: w for t, w in vec.items() if t in self._vocab}
+                dim = model.n_features if hashed else len(self._vocab)
+        if tfidf:
+            resume_vec = np.zeros(dim)
+            if columns:
+                resume_vec[np.fromiter(columns.keys(), dtype=np.int64)] = list(columns.values())
+
+        best: list[tuple[float, int, float]] = []  # min-heap of (score, -position, similarity)
+        for pos in order:
+            if len(best) >= top_k and best[0][0] >= bound[pos]:
+                break
+            job = jobs[candidates[pos]]
+            if job is None:  # removed while we were scoring
+                continue
+            if not tfidf:
+                similarity = engine.compare(rep, job.features.prepared)
+            elif rep.vector is not None:
+                similarity = float(resume_vec[job.term_ids] @ job.weights)
+            else:
+                # Same closed form as TfidfEngine.compare's per-pair fit
+                r = resume_vec[job.term_ids]
+                shared = job.weights[r > 0]
+                c2 = PAIR_IDF ** 2
+                r_norm2 = c2 * rep.sq_norm + (1 - c2) * float(r @ r)
+                j_norm2 = c2 * job.sq_norm + (1 - c2) * float(shared @ shared)
+                similarity = float(r @ job.weights) / (r_norm2 * j_norm2) ** 0.5 if r_norm2 and j_norm2 else 0.0
+            similarity = max(0.0, min(1.0, similarity))
+            score = float(skill_part[pos]) + similarity * 25.0 * job.features.len_mult
+            item = (score, -int(pos), similarity)
+            if len(best) < top_k:
+                heapq.heappush(best, item)
+            elif item > best[0]:
+                heapq.heapreplace(best, item)
+
+        results = []
+        for score, neg_pos, similarity in sorted(best, reverse=True):
+            job = jobs[candidates[-neg_pos]]
+            results.append((job.job_id, job.title, _breakdown(job.features, skills, similarity)))
+        return results
+
+    def stats(self) -> dict:
+        return {
+            "jobs": len(self._rows),
+            "skills": len(self._postings),
+            "terms": len(self._vocab),
+            "taxonomy_version": self.taxonomy_version,
+        }
+
+
+job_index = JobIndex()
@@ -1,22 +1,44 @@
 from fastapi import FastAPI, UploadFile, File, Body, Depends, HTTPException, Header, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import StreamingResponse, JSONResponse
+from fastapi.responses import Response, StreamingResponse, JSONResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
 from datetime import timedelta, datetime
 from typing import Optional
+import asyncio
+import csv
+import hashlib
 import json
+import re
+import zipfile
 
 import io
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
 from reportlab.lib.utils import simpleSplit
-
-from .parser import parse_resume, extract_skills
-from .skills import SKILLS, SYNONYMS, ROLE_KEYWORDS
-from .database import get_db, init_db
-from .models import User, Analysis
+from reportlab import rl_config
+
+# Write report streams as plain Flate-compressed binary. The default extra
+# ASCII85 pass runs in pure Python without reportlab's C accelerator, costs
+# a large share of render time and makes every stream 25% larger.
+rl_config.useA85 = 0
+
+from .parser import ResumeDocument
+from .scoring import compute_score, get_jd_features, rank_resumes
+from .similarity import get_similarity_engine
+from .offload import cpu
+from .timing import Laps, TimingMiddleware, event_counts, stage, timing_stats
+from .workers import run_parse, parse_many, parse_pool_stats, shutdown_parse_pool
+from .cache import jd_cache, parse_cache, report_store
+from .reports import render_queue
+from .uploads import UploadLimitMiddleware, is_pdf, read_pdf_upload, save_image_upload
+from .skills import get_taxonomy
+from .database import SessionLocal, get_db, init_db
+from .models import User, Analysis, AnalysisInput, JobPosting, RescoreJob
+from .jobindex import job_index
+from .dedupe import Fingerprint, find_duplicate, record
+from .rescore import job_status, pause_rescore, start_rescore, stop_rescores
 from .auth import (
     hash_password, verify_password, create_access_token, 
     get_current_user, ACCESS_TOKEN_EXPIRE_MINUTES
@@ -45,22 +67,6 @@ def get_groq_client():
             return None
     return _groq_client
 
-# Small, fast TF-IDF similarity instead of heavy SentenceTransformer
-_vectorizer = None
-
-def get_similarity(text1, text2):
-    """Memory-efficient TF-IDF based similarity"""
-    try:
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-        
-        vectorizer = TfidfVectorizer(stop_words='english')
-        tfidf = vectorizer.fit_transform([text1, text2])
-        return float(cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0])
-    except Exception as e:
-        print(f"Similarity error: {e}")
-        return 0.0
-
 app = FastAPI(title="Resume SaaS Backend")
 os.makedirs("avatars", exist_ok=True)
 app.mount("/avatars", StaticFiles(directory="avatars"), name="avatars")
@@ -71,6 +77,43 @@ async def startup_event():
     print("🔧 Initializing database...")
     init_db()
     print("✅ Database initialized!")
+    # Fail fast on a misconfigured SIMILARITY_BACKEND
+    get_similarity_engine()
+    cpu.start(preload=("app.main",))
+    # Fill the job index in the background; /jobs/match sees jobs as they load
+    _refresh_job_index()
+
+
+def _refresh_job_index():
+    """(Re)build the job index in the background if it predates the current taxonomy."""
+    version = get_taxonomy().version
+    if job_index.taxonomy_version != version and job_index.reset(version):
+        asyncio.get_running_loop().run_in_executor(None, _load_job_index)
+
+
+def _load_job_index():
+    db = SessionLocal()
+    try:
+        rows = db.query(JobPosting.id, JobPosting.title, JobPosting.description).yield_per(1000)
+        for job_id, title, description in rows:
+            job_index.add(job_id, description or "", title or "")
+        print(f"Job index ready: {len(job_index)} jobs (taxonomy {job_index.taxonomy_version})")
+    except Exception as e:
+        print(f"Failed to load job index: {e}")
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    shutdown_parse_pool()
+    stop_rescores()
+    render_queue.shutdown()
+    cpu.shutdown()
+
+# Refuse oversized uploads before their bodies are read (inside CORS so 413s keep CORS headers)
+app.add_middleware(UploadLimitMiddleware)
+# Per-stage timings (Server-Timing header) for requests sending X-Timing
+app.add_middleware(TimingMiddleware)
 
 # Configure CORS - Nuclear option for production
 # Set allow_credentials=False when using "*" to avoid browser blocks
@@ -99,30 +142,30 @@ class TokenResponse(BaseModel):
 
 # ---- HELPER FUNCTIONS ----
 
-# Helper function _extract_skills_from_text removed; imported from .parser
+def _build_rewrite_prompt(resume: ResumeDocument, jd: ResumeDocument) -> str:
+    # Only the sections the rewrite is about; whole text if none were detected
+    resume_text = resume.section_text("summary", "skills", "experience", "projects") or resume.text
+    return f"""
+Analyze the resume below against the provided Job Description (JD). 
+Provide high-quality, professional improvements to make the candidate more competitive for this specific role.
+Return a JSON object with exactly these keys:
+1. "improved_summary": A professional summary (2-3 sentences) tailored to this JD.
+2. "skills_to_add": A list of specific hard skills or tools from the JD that are not prominent in the resume.
+3. "bullet_suggestions": A list of objects, each with:
+   - "bullet": A polished, action-oriented resume bullet point using the STAR method (Situation, Task, Action, Result) that incorporates keywords from the JD.
+   - "why": A short explanation of why this bullet point is particularly effective for this JD.
 
+Rules:
+- JSON format only.
+- No conversational filler.
+- Ensure the advice is actionable and high-impact.
 
-def _detect_role(jd_text: str) -> str:
-    jd_low = jd_text.lower()
-    jd_len = len(jd_low)
-    
-    # If JD is too short, don't guess a specific role
-    if jd_len < 40:
-        return "Generic / Undefined Role"
-        
-    best_role = "General Software Engineer"
-    best_hits = 0
-    for role, keywords in ROLE_KEYWORDS.items():
-        hits = sum(1 for kw in keywords if kw.lower() in jd_low)
-        if hits > best_hits:
-            best_hits = hits
-            best_role = role
-            
-    # If no specific keywords matched despite reasonable length, call it general
-    if best_hits == 0:
-        return "Software Professional" if jd_len < 300 else "General Software Engineer"
-        
-    return best_role
+Resume:
+{resume_text[:3000]}
+
+JD:
+{jd.text[:3000]}
+"""
 
 # ---- AUTH ENDPOINTS ----
 # ---- AUTH ENDPOINTS ----
@@ -285,11 +328,9 @@ async def upload_avatar(
     folder = "avatars"
     os.makedirs(folder, exist_ok=True)
 
-    filename = f"user_{user.id}_{file.filename}"
-    filepath = os.path.join(folder, filename)
-
-    with open(filepath, "wb") as f:
-        f.write(await file.read())
+    stem = os.path.splitext(os.path.basename(file.filename or "avatar"))[0]
+    filepath = await save_image_upload(file, os.path.join(folder, f"user_{user.id}_{stem}"))
+    filename = os.path.basename(filepath)
 
     # Use BACKEND_URL from env if set, otherwise fallback to request base
     backend_url = os.getenv("BACKEND_URL")
@@ -316,148 +357,205 @@ def home():
     return {"status": "Backend running", "message": "Resume SaaS API is live 🚀"}
 
 
+@app.get("/metrics")
+def metrics():
+    """Cache and pool counters for sizing, stage timing histograms, fallback counts,
+    plus the loaded skill taxonomy version"""
+    taxonomy = get_taxonomy()
+    return {
+        "parse_cache": parse_cache.stats(),
+        "jd_cache": jd_cache.stats(),
+        "report_store": report_store.stats(),
+        "render_queue": render_queue.stats(),
+        "parse_pool": parse_pool_stats(),
+        "job_index": job_index.stats(),
+        "cpu": cpu.stats(),
+        "timings": timing_stats(),
+        # Degraded paths taken, e.g. similarity.fallback: resumes scored on skills alone
+        "events": event_counts(),
+        "taxonomy": {"version": taxonomy.version, "skills": len(taxonomy.skills)},
+    }
+
+
 @app.post("/upload-resume")
 async def upload_resume(file: UploadFile = File(...)):
     """Upload and parse a PDF resume"""
     try:
-        content = await file.read()
-        parsed = parse_resume(content)
+        content = await read_pdf_upload(file)
+        parsed = await run_parse(content)
         return {"filename": file.filename, "parsed": parsed}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Failed to parse resume: {str(e)}")
 
 
-def compute_score(resume_text: str, jd_text: str, resume_skills_input: list[str] | None = None) -> dict:
-    """Compute match score between resume and JD"""
-    resume_text = (resume_text or "").lower()
-    jd_text = (jd_text or "").lower()
-    resume_skills_input = resume_skills_input or []
+# Limits for one bulk request
+BULK_MAX_FILES = int(os.getenv("BULK_MAX_FILES", 500))
+BULK_MAX_FILE_BYTES = int(os.getenv("BULK_MAX_FILE_BYTES", 10 * 1024 * 1024))
+
+
+async def _iter_bulk_files(files: list[UploadFile]):
+    """Yield (filename, bytes) for every PDF in the upload, expanding zip archives.
+
+    Files are read one at a time as the parser asks for them.
+    """
+    count = 0
+    for upload in files:
+        name = upload.filename or "upload"
+        head = await upload.read(4)
+        await upload.seek(0)
+
+        if head == b"PK\x03\x04" or name.lower().endswith(".zip"):
+            try:
+                archive = zipfile.ZipFile(upload.file)
+            except zipfile.BadZipFile as e:
+                yield name, ValueError(f"Invalid zip archive: {e}")
+                continue
+            for info in archive.infolist():
+                member = f"{name}/{info.filename}"
+                if info.is_dir() or not info.filename.lower().endswith(".pdf") or "__MACOSX" in info.filename:
+                    continue
+                count += 1
+                if count > BULK_MAX_FILES:
+                    yield member, ValueError(f"Batch limit of {BULK_MAX_FILES} files reached")
+                    return
+                if info.file_size > BULK_MAX_FILE_BYTES:
+                    yield member, ValueError("File too large")
+                    continue
+                try:
+                    content = await asyncio.to_thread(archive.read, info)
+                except Exception as e:
+                    yield member, ValueError(f"Could not read archive member: {e}")
+                    continue
+                yield member, content if is_pdf(content) else ValueError("Not a PDF file")
+            continue
 
-    if not resume_text or not jd_text:
-        return {"error": "Resume or JD missing"}
+        count += 1
+        if count > BULK_MAX_FILES:
+            yield name, ValueError(f"Batch limit of {BULK_MAX_FILES} files reached")
+            return
+        content = await upload.read(BULK_MAX_FILE_BYTES + 1)
+        if len(content) > BULK_MAX_FILE_BYTES:
+            yield name, ValueError("File too large")
+        elif not is_pdf(content):
+            yield name, ValueError("Not a PDF file")
+        else:
+            yield name, content
 
-    resume_skills: set[str] = set(s.lower() for s in resume_skills_input)
-    if not resume_skills:
-        resume_skills = set(extract_skills(resume_text))
 
-    jd_skills = set(extract_skills(jd_text))
+@app.post("/bulk-upload-resumes")
+async def bulk_upload_resumes(files: list[UploadFile] = File(...)):
+    """Parse many PDFs (or zip archives of PDFs); streams one NDJSON line per resume"""
 
-    matched_jd_skills = sorted(s for s in jd_skills if s in resume_skills)
-    missing_skills = sorted(s for s in jd_skills if s not in resume_skills)
-    resume_extra_skills = sorted(s for s in resume_skills if s not in jd_skills)
+    async def ndjson():
+        async for result in parse_many(_iter_bulk_files(files)):
+            yield json.dumps(result, default=str) + "\n"
 
-    # SCORING LOGIC
-    # 1. Skill Match (Primary Factor)
-    if jd_skills:
-        coverage = len(matched_jd_skills) / len(jd_skills)
-    else:
-        coverage = 0.0
+    return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+
+def _score_request(resume_text: str, jd_text: str, skills: list[str]) -> dict:
+    return compute_score(resume_text, get_jd_features(jd_text), skills)
 
-    skill_score = coverage * 75.0  # Max 75 points from skills
 
-    # 2. Semantic Similarity (Secondary Factor)
+@app.post("/score")
+async def score_resume(data: dict = Body(...)):
+    """Score resume against job description"""
+    result = await cpu.run("score", _score_request, data.get("resume") or "", data.get("jd") or "", data.get("skills") or [])
+    with stage("score.serialize"):
+        return JSONResponse(result)
+
+
+RANK_MAX_RESUMES = int(os.getenv("RANK_MAX_RESUMES", 2000))
+
+
+def _top_k(data: dict, default: int = 10) -> int:
     try:
-        similarity = get_similarity(resume_text, jd_text)
-        # Clamp between 0 and 1
-        similarity = max(0.0, min(1.0, similarity))
-    except Exception:
-        similarity = 0.0
-
-    # 3. JD Depth Penalty (Prevents inflated scores for low-effort or single-word JDs)
-    jd_len = len(jd_text)
-    jd_skill_count = len(jd_skills)
-    
-    # Length Multiplier
-    if jd_len < 50: len_mult = 0.2
-    elif jd_len < 200: len_mult = 0.5
-    elif jd_len < 600: len_mult = 0.85
-    else: len_mult = 1.0
-    
-    # Skill Density Multiplier
-    if jd_skill_count == 0: skill_mult = 0.0
-    elif jd_skill_count == 1: skill_mult = 0.35
-    elif jd_skill_count == 2: skill_mult = 0.65
-    elif jd_skill_count <= 4: skill_mult = 0.9
-    else: skill_mult = 1.0
-    
-    # Final quality multiplier (weighted average)
-    quality_multiplier = (len_mult * 0.4) + (skill_mult * 0.6)
-
-    # 4. Final Adjustment Logic
-    # If JD is extremely short and has no detected skills, return 0
-    if jd_len < 10 and not jd_skills:
-        return {
-            "final_score": 0.0,
-            "skill_score": 0.0,
-            "jd_similarity_score": 0.0,
-            "similarity_raw": 0.0,
-            "matched_jd_skills": [],
-            "missing_skills": [],
-            "resume_extra_skills": [],
-            "role": "Unknown",
-        }
-
-    # If JD has no skills, rely more on semantic but penalize valid "tech" comparison
-    if not jd_skills:
-        if similarity < 0.5:
-            jd_score = 0.0
-        else:
-            jd_score = similarity * 50.0 
-    else:
-        jd_score = similarity * 25.0
+        return max(1, int(data.get("top_k") or default))
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="top_k must be a positive integer")
 
-    # Apply the JD Depth Penalty to both scores
-    skill_score = skill_score * quality_multiplier
-    jd_score = jd_score * len_mult
 
-    final_score = round(skill_score + jd_score, 2)
-    
-    # Cap at 100
-    final_score = min(100.0, final_score)
+def _rank_request(jd_text: str, texts: list[str], top_k: int, skills: list) -> tuple[str, list]:
+    jd = get_jd_features(jd_text)
+    return jd.role, rank_resumes(texts, jd, top_k, skills)
+
 
-    detected_role = _detect_role(jd_text)
+@app.post("/rank")
+async def rank_candidates(data: dict = Body(...)):
+    """Rank many resumes against one JD.
 
+    Body: {"jd": str, "resumes": [str | {"id", "text", "skills"}], "top_k": int}
+    Returns the top_k in /score's breakdown format, best first.
+    """
+    jd_text = data.get("jd") or ""
+    items = data.get("resumes") or []
+    if not jd_text:
+        raise HTTPException(status_code=400, detail="JD missing")
+    if not isinstance(items, list) or not items:
+        raise HTTPException(status_code=400, detail="No resumes to rank")
+    if len(items) > RANK_MAX_RESUMES:
+        raise HTTPException(status_code=413, detail=f"At most {RANK_MAX_RESUMES} resumes per request")
+    items = [item if isinstance(item, dict) else {"text": item} for item in items]
+    top_k = _top_k(data)
+
+    role, ranked = await cpu.run(
+        "rank", _rank_request, jd_text,
+        [item.get("text") or "" for item in items], top_k, [item.get("skills") for item in items],
+    )
     return {
-        "final_score": float(final_score),
-        "skill_score": float(round(skill_score, 2)),
-        "jd_similarity_score": float(round(jd_score, 2)),
-        "similarity_raw": float(round(similarity, 4)),
-        "matched_jd_skills": matched_jd_skills,
-        "missing_skills": missing_skills,
-        "resume_extra_skills": resume_extra_skills,
-        "role": detected_role,
+        "role": role,
+        "ranked": sum(1 for item in items if item.get("text")),
+        "results": [{"index": i, "id": items[i].get("id", i), **result} for i, result in ranked],
     }
 
 
-@app.post("/score")
-async def score_resume(data: dict = Body(...)):
-    """Score resume against job description"""
-    return compute_score(data.get("resume") or "", data.get("jd") or "", data.get("skills") or [])
+# --- Professional Color Palette ---
+COLOR_NAVY = (0.02, 0.05, 0.1)      # Header
+COLOR_MINT = (0.0, 0.7, 0.6)        # Success/Accent (a bit darker for PDF print)
+COLOR_ROSE = (0.8, 0.1, 0.4)        # Alert
+COLOR_SKY = (0.2, 0.5, 0.8)         # Secondary
+COLOR_GRAY_BG = (0.96, 0.97, 0.98)  # Section Bg
+COLOR_TEXT = (0.15, 0.15, 0.15)     # Main Text
 
+REPORT_FOOTER = "Confidential Document | Generated by ResumeMatch AI Pro | Higher hiring probability through data-driven analysis"
 
-import uuid
 
-# Simple in-memory cache for reports (cleared on restart)
-REPORT_CACHE = {}
+def _define_report_forms(c, width):
+    """Record chrome repeated on every page as a form XObject.
 
-def _generate_pdf_buffer(result):
-    """Advanced Professional PDF Match Report"""
-    buffer = io.BytesIO()
-    c = canvas.Canvas(buffer, pagesize=A4)
+    The form is written to the PDF once and each page just references it
+    with doForm. One-off chrome (header banner, score card) is cheaper drawn
+    inline: a form costs its own stream and resource dictionary.
+    """
+    c.saveState()
+    c.beginForm("footer")
+    c.setFont("Helvetica", 8)
+    c.setFillColorRGB(0.6, 0.6, 0.6)
+    c.drawCentredString(width / 2, 25, REPORT_FOOTER)
+    c.endForm()
+    c.restoreState()
+
+
+def safe_text(text):
+    if not text: return ""
+    # ReportLab build-in fonts (Helvetica) are limited to Latin-1
+    return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+
+def _draw_report(c, result):
+    """Draw one report starting on the canvas's current (empty) page.
+
+    The footer form must already be defined; the last page is left open.
+    """
+    laps = Laps()
     width, height = A4
-    
-    # --- Professional Color Palette ---
-    COLOR_NAVY = (0.02, 0.05, 0.1)      # Header
-    COLOR_MINT = (0.0, 0.7, 0.6)        # Success/Accent (a bit darker for PDF print)
-    COLOR_ROSE = (0.8, 0.1, 0.4)        # Alert
-    COLOR_SKY = (0.2, 0.5, 0.8)         # Secondary
-    COLOR_GRAY_BG = (0.96, 0.97, 0.98)  # Section Bg
-    COLOR_TEXT = (0.15, 0.15, 0.15)     # Main Text
-    
-    def safe_text(text):
-        if not text: return ""
-        # ReportLab build-in fonts (Helvetica) are limited to Latin-1
-        return str(text).encode('latin-1', 'replace').decode('latin-1')
+
+    def new_page():
+        c.doForm("footer")
+        c.showPage()
+        return height - 50
 
     # --- Header Banner ---
     c.setFillColorRGB(*COLOR_NAVY)
@@ -519,13 +617,13 @@ def _generate_pdf_buffer(result):
     c.setLineWidth(0.5)
     c.line(40, y, width - 40, y)
     y -= 30
+    laps.mark("pdf.header")
 
     # --- Content Sections ---
     def draw_list_section(title, items, icon, color):
         nonlocal y
         if y < 150:
-            c.showPage()
-            y = height - 50
+            y = new_page()
         
         c.setFillColorRGB(*color)
         c.setFont("Helvetica-Bold", 13)
@@ -540,8 +638,7 @@ def _generate_pdf_buffer(result):
         else:
             for item in items:
                 if y < 60:
-                    c.showPage()
-                    y = height - 50
+                    y = new_page()
                 c.drawString(62, y, "-") # Simple dash
                 c.drawString(75, y, safe_text(item))
                 y -= 16
@@ -550,12 +647,12 @@ def _generate_pdf_buffer(result):
     draw_list_section("CORE COMPETENCIES MATCHED", result["matched_jd_skills"], "V", (0, 0.5, 0.2))
     draw_list_section("CRITICAL SKILL GAPS", result["missing_skills"], "X", (0.7, 0, 0.1))
     draw_list_section("RELEVANT DIFFERENTIATORS", result["resume_extra_skills"], "*", (0.1, 0.3, 0.7))
+    laps.mark("pdf.skills")
 
     # --- AI Recommendations Section ---
     if result.get("improved_summary") or result.get("bullet_suggestions"):
         if y < 220:
-            c.showPage()
-            y = height - 50
+            y = new_page()
         
         y -= 10
         c.setFillColorRGB(*COLOR_GRAY_BG)
@@ -574,7 +671,7 @@ def _generate_pdf_buffer(result):
             # Text Wrap
             lines = simpleSplit(safe_text(result["improved_summary"]), "Helvetica", 10.5, width - 100)
             for line in lines:
-                if y < 50: c.showPage(); y = height - 50
+                if y < 50: y = new_page()
                 c.drawString(60, y, line)
                 y -= 15
             y -= 25
@@ -585,7 +682,7 @@ def _generate_pdf_buffer(result):
             c.drawString(40, y, "HIGH-IMPACT BULLET POINTS (STAR METHOD):")
             y -= 25
             for sug in result["bullet_suggestions"]:
-                if y < 90: c.showPage(); y = height - 50
+                if y < 90: y = new_page()
                 
                 # Handle both string and object formats
                 bullet = sug.get("bullet", "") if isinstance(sug, dict) else str(sug)
@@ -598,7 +695,7 @@ def _generate_pdf_buffer(result):
                 
                 b_lines = simpleSplit(safe_text(bullet), "Helvetica-Bold", 10.5, width - 120)
                 for line in b_lines:
-                    if y < 50: c.showPage(); y = height - 50
+                    if y < 50: y = new_page()
                     c.drawString(65, y, line)
                     y -= 15
                 
@@ -608,17 +705,24 @@ def _generate_pdf_buffer(result):
                     c.setFillColorRGB(0.4, 0.4, 0.4)
                     w_lines = simpleSplit(f"Strategy: {safe_text(why)}", "Helvetica-Oblique", 9.5, width - 130)
                     for line in w_lines:
-                        if y < 50: c.showPage(); y = height - 50
+                        if y < 50: y = new_page()
                         c.drawString(75, y, line)
                         y -= 13
                 y -= 12
+    laps.mark("pdf.recommendations")
 
     # --- Footer ---
-    c.setFont("Helvetica", 8)
-    c.setFillColorRGB(0.6, 0.6, 0.6)
-    c.drawCentredString(width / 2, 25, "Confidential Document | Generated by ResumeMatch AI Pro | Higher hiring probability through data-driven analysis")
+    c.doForm("footer")
 
-    c.save()
+
+def _generate_pdf_buffer(result):
+    """Advanced Professional PDF Match Report"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    _define_report_forms(c, A4[0])
+    _draw_report(c, result)
+    with stage("pdf.save"):
+        c.save()
     buffer.seek(0)
     return buffer
 
@@ -633,57 +737,390 @@ def _generate_fallback_pdf(result, error_msg=""):
     buffer.seek(0)
     return buffer
 
+def _render_report(result):
+    """Professional report, or the plain fallback if rendering fails"""
+    try:
+        return _generate_pdf_buffer(result)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return _generate_fallback_pdf(result, str(e))
+
 @app.post("/score-report")
 async def score_report(data: dict = Body(...)):
     """Legacy endpoint (kept for safety, but we move to two-step)"""
     try:
-        result = compute_score(data.get("resume") or "", data.get("jd") or "", data.get("skills") or [])
-        buffer = _generate_pdf_buffer(result)
+        result = await cpu.run("score", _score_request, data.get("resume") or "", data.get("jd") or "", data.get("skills") or [])
+        buffer = await cpu.run("report", _generate_pdf_buffer, result)
         return StreamingResponse(buffer, media_type="application/pdf", headers={"Content-Disposition": "attachment; filename=resume_match_report.pdf"})
+    except HTTPException:
+        raise
     except Exception as e:
         return JSONResponse(status_code=500, content={"detail": str(e)})
 
+# Request fields that determine a report's content
+_REPORT_FIELDS = ("resume", "jd", "skills", "user_name", "improved_summary", "skills_to_add", "bullet_suggestions")
+
+
+def _report_id(data: dict) -> str:
+    """Content hash of a report request, so identical requests share one render."""
+    payload = {field: data.get(field) for field in _REPORT_FIELDS}
+    key = json.dumps(
+        [payload, get_taxonomy().version, get_similarity_engine().name], sort_keys=True, default=str
+    )
+    return hashlib.sha256(key.encode()).hexdigest()[:32]
+
+
+def _enrich_report(result: dict, data: dict) -> dict:
+    """Enrich result with extra data for the professional PDF"""
+    result["user_name"] = data.get("user_name") or "Guest"
+    result["improved_summary"] = data.get("improved_summary")
+    result["skills_to_add"] = data.get("skills_to_add")
+    result["bullet_suggestions"] = data.get("bullet_suggestions")
+    return result
+
+
+async def _build_report(data: dict) -> bytes:
+    # Render jobs are already limited by the render workers; wait rather than shed
+    result = await cpu.run(
+        "score", _score_request, data.get("resume") or "", data.get("jd") or "", data.get("skills") or [],
+        shed=False,
+    )
+
+    buffer = await cpu.run("report", _render_report, _enrich_report(result, data), shed=False)
+    return buffer.getvalue()
+
+
+def _report_job_response(status: dict) -> dict:
+    job_id = status["job_id"]
+    return {
+        **status,
+        "status_url": f"/report-jobs/{job_id}",
+        # Return URL ending in .pdf so browser sees it as file
+        "download_url": f"/download-report/{job_id}/resume_match_report.pdf",
+    }
+
+
 @app.post("/init-score-download")
 async def init_score_download(data: dict = Body(...)):
-    """Step 1: Generate PDF and return ID"""
-    try:
-        result = compute_score(data.get("resume") or "", data.get("jd") or "", data.get("skills") or [])
-        
-        # Enrich result with extra data for the professional PDF
-        result["user_name"] = data.get("user_name") or "Guest"
-        result["improved_summary"] = data.get("improved_summary")
-        result["skills_to_add"] = data.get("skills_to_add")
-        result["bullet_suggestions"] = data.get("bullet_suggestions")
+    """Step 1: Queue the PDF render and return its job ID straight away.
+
+    The download URL works at once: it waits for a render still in progress.
+    """
+    report_id = _report_id(data)
+    status = await render_queue.submit(report_id, lambda: _build_report(data))
+    return _report_job_response(status)
 
+
+@app.get("/report-jobs/{job_id}")
+async def report_job_status(job_id: str):
+    """queued, rendering, done or failed"""
+    status = render_queue.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Report expired or not found")
+    return _report_job_response(status)
+
+
+def _byte_range(header: str, size: int) -> tuple[int, int] | None:
+    """(start, end inclusive) of a single "bytes=" range; None to send the
+    whole body (absent, malformed or multi-range), ValueError if unsatisfiable."""
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, _, last = (part.strip() for part in spec.strip().partition("-"))
+    if not (first or last) or not all(part.isdigit() for part in (first, last) if part):
+        return None  # malformed: ignored
+    if not first:  # suffix range: the last N bytes
+        length = int(last)
+        if length <= 0 or size <= 0:
+            raise ValueError("range not satisfiable")
+        return max(0, size - length), size - 1
+    start = int(first)
+    if last and int(last) < start:
+        return None  # syntactically invalid: ignored, per RFC 9110
+    if start >= size:
+        raise ValueError("range not satisfiable")
+    end = int(last) if last else size - 1
+    return start, min(end, size - 1)
+
+
+def _pdf_response(request: Request, data: bytes, filename: str) -> Response:
+    """PDF bytes with validators and cache headers; honours If-None-Match and Range."""
+    etag = f'"{hashlib.blake2b(data, digest_size=16).hexdigest()}"'
+    headers = {
+        "ETag": etag,
+        "Accept-Ranges": "bytes",
+        # Reports never change under an id, but are private to the requester
+        "Cache-Control": f"private, max-age={report_store.ttl}, immutable",
+        "Content-Disposition": f"attachment; filename={filename}",
+    }
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    if range_header and (not if_range or if_range.strip() == etag):
         try:
-            buffer = _generate_pdf_buffer(result)
-        except Exception as e:
-            # Fallback
-            import traceback
-            traceback.print_exc()
-            buffer = _generate_fallback_pdf(result, str(e))
-        
-        report_id = str(uuid.uuid4())
-        REPORT_CACHE[report_id] = buffer
-        # Return URL ending in .pdf so browser sees it as file
-        return {"download_url": f"/download-report/{report_id}/resume_match_report.pdf"}
-        
-    except Exception as e:
-        return JSONResponse(status_code=500, content={"detail": str(e)})
+            byte_range = _byte_range(range_header, len(data))
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{len(data)}"})
+        if byte_range is not None:
+            start, end = byte_range
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+            return Response(data[start:end + 1], status_code=206, media_type="application/pdf", headers=headers)
+
+    # The stored bytes go out as they are, with Content-Length set from them
+    return Response(data, media_type="application/pdf", headers=headers)
+
 
 @app.get("/download-report/{report_id}/{filename}")
-async def download_report_endpoint(report_id: str, filename: str):
+async def download_report_endpoint(report_id: str, filename: str, request: Request):
     """Step 2: Serve the PDF. Filename param is ignored logic-wise but helps browser."""
-    if report_id not in REPORT_CACHE:
+    data = await asyncio.to_thread(report_store.get, report_id)
+    if data is None and await render_queue.wait(report_id):
+        data = await asyncio.to_thread(report_store.get, report_id)
+    if data is None:
+        status = render_queue.status(report_id)
+        if status is not None and status["status"] == "failed":
+            raise HTTPException(status_code=500, detail=f"Report rendering failed: {status['error']}")
+        if status is not None:
+            raise HTTPException(status_code=503, detail="Report is still rendering", headers={"Retry-After": "2"})
         raise HTTPException(status_code=404, detail="Report expired or not found")
-    
-    buffer = REPORT_CACHE[report_id]
-    buffer.seek(0)
-    
-    return StreamingResponse(
-        buffer,
+
+    return _pdf_response(request, data, filename)
+
+
+BATCH_REPORT_MAX_CANDIDATES = int(os.getenv("BATCH_REPORT_MAX_CANDIDATES", 200))
+# The single-document format renders on one canvas in one job and is held in
+# memory until done, so it takes fewer candidates than the streamed zip
+BATCH_REPORT_MAX_PDF_CANDIDATES = int(os.getenv("BATCH_REPORT_MAX_PDF_CANDIDATES", 25))
+
+
+def _candidate_result(candidate: dict, jd_text: str) -> dict:
+    """Score one shortlisted candidate (their own "jd" overrides the shared one)."""
+    try:
+        result = _score_request(
+            candidate.get("resume") or "", candidate.get("jd") or jd_text, candidate.get("skills") or []
+        )
+    except Exception as e:
+        result = {"error": str(e)}
+    if "error" in result:
+        result["user_name"] = candidate.get("user_name") or "Guest"
+        return result
+    return _enrich_report(result, candidate)
+
+
+def _candidate_report(candidate: dict, jd_text: str) -> tuple[dict, bytes | None]:
+    result = _candidate_result(candidate, jd_text)
+    if "error" in result:
+        return result, None
+    return result, _render_report(result).getvalue()
+
+
+def _ranked(results: list[dict]) -> list[int]:
+    """Indexes best first; candidates that could not be scored go last."""
+    return sorted(range(len(results)), key=lambda i: ("error" in results[i], -results[i].get("final_score", 0.0)))
+
+
+def _clip(text, font: str, size: float, width: float) -> str:
+    """The part of ``text`` that fits on one line of ``width`` points."""
+    return (simpleSplit(safe_text(text), font, size, width) or [""])[0]
+
+
+def _draw_ranking_table(c, results: list[dict], order: list[int]):
+    """Summary pages: one row per candidate with score, skill coverage and top gaps."""
+    width, height = A4
+    c.setFillColorRGB(*COLOR_NAVY)
+    c.rect(0, height - 100, width, 100, fill=1, stroke=0)
+    c.setFillColorRGB(1, 1, 1)
+    c.setFont("Helvetica-Bold", 26)
+    c.drawString(40, height - 55, "SHORTLIST RANKING")
+    c.setFont("Helvetica", 10)
+    c.setFillColorRGB(0.7, 0.7, 0.7)
+    c.drawString(40, height - 75, f"{len(results)} candidates, best match first")
+    c.drawRightString(width - 40, height - 75, datetime.now().strftime("%B %d, %Y"))
+
+    columns = ((40, "#"), (65, "CANDIDATE"), (230, "SCORE"), (285, "SKILLS"), (340, "TOP GAPS"))
+
+    def header_row(y):
+        c.setFillColorRGB(*COLOR_GRAY_BG)
+        c.rect(30, y - 6, width - 60, 20, fill=1, stroke=0)
+        c.setFillColorRGB(*COLOR_NAVY)
+        c.setFont("Helvetica-Bold", 9.5)
+        for x, label in columns:
+            c.drawString(x, y, label)
+        return y - 22
+
+    y = header_row(height - 135)
+    for rank, i in enumerate(order, 1):
+        if y < 60:
+            c.doForm("footer")
+            c.showPage()
+            y = header_row(height - 50)
+        result = results[i]
+        c.setFont("Helvetica", 9.5)
+        c.setFillColorRGB(*COLOR_TEXT)
+        c.drawString(40, y, str(rank))
+        c.drawString(65, y, _clip(result.get("user_name"), "Helvetica", 9.5, 155))
+        if "error" in result:
+            c.setFillColorRGB(*COLOR_ROSE)
+            c.drawString(230, y, _clip(f"Not scored: {result['error']}", "Helvetica", 9.5, width - 270))
+        else:
+            matched, missing = result["matched_jd_skills"], result["missing_skills"]
+            c.drawString(230, y, f"{result['final_score']}%")
+            c.drawString(285, y, f"{len(matched)}/{len(matched) + len(missing)}")
+            c.drawString(340, y, _clip(", ".join(missing[:6]) or "-", "Helvetica", 9.5, width - 380))
+        y -= 16
+    c.doForm("footer")
+
+
+def _generate_batch_pdf(results: list[dict]) -> bytes:
+    """One document for a shortlist: the ranking table, then each report best first."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A4)
+    _define_report_forms(c, A4[0])
+    order = _ranked(results)
+    _draw_ranking_table(c, results, order)
+    for i in order:
+        if "error" not in results[i]:
+            c.showPage()
+            _draw_report(c, results[i])
+    with stage("pdf.save"):
+        c.save()
+    return buffer.getvalue()
+
+
+def _ranking_csv(results: list[dict], files: list[str | None]) -> bytes:
+    out = io.StringIO()
+    writer = csv.writer(out)
+    writer.writerow(["rank", "file", "candidate", "final_score", "skill_score", "jd_similarity_score",
+                     "matched_skills", "missing_skills", "error"])
+    for rank, i in enumerate(_ranked(results), 1):
+        r = results[i]
+        writer.writerow([
+            rank, files[i] or "", r.get("user_name"), r.get("final_score", ""), r.get("skill_score", ""),
+            r.get("jd_similarity_score", ""), " ".join(r.get("matched_jd_skills", [])),
+            " ".join(r.get("missing_skills", [])), r.get("error", ""),
+        ])
+    return out.getvalue().encode("utf-8")
+
+
+async def _run_windowed(jobs, window: int):
+    """Run (index, stage, func, *args) jobs on the CPU pool, at most ``window``
+    at once, and yield (index, result) as each finishes."""
+    async def one(index, stage_name, func, *args):
+        return index, await cpu.run(stage_name, func, *args, shed=False)
+
+    jobs = iter(jobs)
+    pending = set()
+    try:
+        while True:
+            while len(pending) < window:
+                job = next(jobs, None)
+                if job is None:
+                    break
+                pending.add(asyncio.ensure_future(one(*job)))
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Client went away mid-stream: don't keep rendering for nobody
+        for task in pending:
+            task.cancel()
+
+
+class _ZipSink(io.RawIOBase):
+    """Unseekable write-only target; zipfile then writes entries with data
+    descriptors, and the bytes written so far can be handed out and dropped."""
+
+    def __init__(self):
+        self._chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def _report_filename(index: int, result: dict) -> str:
+    name = re.sub(r"[^A-Za-z0-9]+", "_", result.get("user_name") or "").strip("_")[:40]
+    return f"{index + 1:03d}_{name or 'candidate'}.pdf"
+
+
+async def _batch_zip(candidates: list[dict], jd_text: str, window: int):
+    """Zip of one report per candidate plus ranking.csv, yielded as reports finish."""
+    sink = _ZipSink()
+    results: list[dict | None] = [None] * len(candidates)
+    files: list[str | None] = [None] * len(candidates)
+    with zipfile.ZipFile(sink, "w", zipfile.ZIP_STORED) as archive:
+        jobs = ((i, "report", _candidate_report, c, jd_text) for i, c in enumerate(candidates))
+        async for i, (result, pdf) in _run_windowed(jobs, window):
+            if pdf is not None:
+                files[i] = _report_filename(i, result)
+                archive.writestr(files[i], pdf)
+            # Keep only the score breakdown for the ranking, not the long AI text
+            results[i] = {k: v for k, v in result.items() if k not in ("improved_summary", "bullet_suggestions")}
+            yield sink.drain()
+        archive.writestr("ranking.csv", _ranking_csv(results, files))
+    yield sink.drain()
+
+
+@app.post("/batch-report")
+async def batch_report(data: dict = Body(...)):
+    """One report for a shortlist of candidates.
+
+    Body: {"jd": str, "format": "pdf" | "zip",
+           "candidates": [{"resume", "user_name", "jd", "skills", "improved_summary", "bullet_suggestions"}]}
+    pdf: a ranking table followed by each candidate's report, best first
+         (at most BATCH_REPORT_MAX_PDF_CANDIDATES).
+    zip: one PDF per candidate plus ranking.csv, streamed as reports finish.
+    Candidates are scored and (for zip) rendered in parallel on the CPU pool.
+    """
+    jd_text = data.get("jd") or ""
+    candidates = data.get("candidates") or []
+    fmt = (data.get("format") or "pdf").lower()
+    if fmt not in ("pdf", "zip"):
+        raise HTTPException(status_code=400, detail="format must be pdf or zip")
+    if not isinstance(candidates, list) or not candidates:
+        raise HTTPException(status_code=400, detail="No candidates")
+    if len(candidates) > BATCH_REPORT_MAX_CANDIDATES:
+        raise HTTPException(status_code=413, detail=f"At most {BATCH_REPORT_MAX_CANDIDATES} candidates per batch")
+    if fmt == "pdf" and len(candidates) > BATCH_REPORT_MAX_PDF_CANDIDATES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {BATCH_REPORT_MAX_PDF_CANDIDATES} candidates in one PDF; use format zip for more",
+        )
+    candidates = [c if isinstance(c, dict) else {"resume": c} for c in candidates]
+    # Refuse up front when busy; once started, the batch queues rather than failing halfway
+    cpu.admit("report")
+    window = cpu.workers * 2
+
+    if fmt == "zip":
+        return StreamingResponse(
+            _batch_zip(candidates, jd_text, window),
+            media_type="application/zip",
+            headers={"Content-Disposition": "attachment; filename=shortlist_reports.zip"},
+        )
+
+    results: list[dict | None] = [None] * len(candidates)
+    jobs = ((i, "score", _candidate_result, c, jd_text) for i, c in enumerate(candidates))
+    async for i, result in _run_windowed(jobs, window):
+        results[i] = result
+    pdf = await cpu.run("report", _generate_batch_pdf, results, shed=False)
+    return Response(
+        pdf,
         media_type="application/pdf",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+        headers={"Content-Disposition": "attachment; filename=shortlist_report.pdf"},
     )
 
 
@@ -701,27 +1138,7 @@ async def rewrite_resume(data: dict = Body(...)):
     if not resume_text or not jd_text:
         return {"error": "Resume or JD missing"}
 
-    prompt = f"""
-Analyze the resume below against the provided Job Description (JD). 
-Provide high-quality, professional improvements to make the candidate more competitive for this specific role.
-Return a JSON object with exactly these keys:
-1. "improved_summary": A professional summary (2-3 sentences) tailored to this JD.
-2. "skills_to_add": A list of specific hard skills or tools from the JD that are not prominent in the resume.
-3. "bullet_suggestions": A list of objects, each with:
-   - "bullet": A polished, action-oriented resume bullet point using the STAR method (Situation, Task, Action, Result) that incorporates keywords from the JD.
-   - "why": A short explanation of why this bullet point is particularly effective for this JD.
-
-Rules:
-- JSON format only.
-- No conversational filler.
-- Ensure the advice is actionable and high-impact.
-
-Resume:
-{resume_text[:3000]}
-
-JD:
-{jd_text[:3000]}
-"""
+    prompt = _build_rewrite_prompt(ResumeDocument(resume_text), ResumeDocument(jd_text))
 
     last_exception = "Unknown error"
     for attempt in range(2):
@@ -772,15 +1189,24 @@ async def analyze_resume(
     except:
         raise HTTPException(status_code=401, detail="Invalid token")
     
-    resume_text = data.get("resume", "")
-    jd_text = data.get("jd", "")
-    scores = compute_score(resume_text, jd_text)
-    
+    resume_text = data.get("resume") or ""
+    jd_text = data.get("jd") or ""
+    if not resume_text or not jd_text:
+        raise HTTPException(status_code=400, detail="Resume or JD missing")
+
+    # Rescoring (almost) the same resume against (almost) the same JD
+    # updates the earlier analysis instead of adding another row
+    fingerprint = await cpu.run("fingerprint", Fingerprint, resume_text, jd_text)
+    duplicate = find_duplicate(db, current_user.id, fingerprint)
+    if duplicate is not None and duplicate.content_key == fingerprint.content_key:
+        scores = json.loads(duplicate.result)  # exact repeat: reuse the stored result
+    else:
+        scores = await cpu.run("score", _score_request, resume_text, jd_text, [])
+
     if "error" in scores:
         raise HTTPException(status_code=400, detail=scores["error"])
-    
-    analysis = Analysis(
-        user_id=current_user.id,
+
+    fields = dict(
         resume_name=data.get("resume_name", "resume.pdf"),
         job_title=scores.get("role", "Unknown"),
         job_description=jd_text,
@@ -790,9 +1216,23 @@ async def analyze_resume(
         missing_skills=json.dumps(scores.get("missing_skills", [])),
         bonus_skills=json.dumps(scores.get("resume_extra_skills", []))
     )
-    db.add(analysis)
+    analysis = db.get(Analysis, duplicate.analysis_id) if duplicate is not None else None
+    if analysis is not None:
+        for name, value in fields.items():
+            setattr(analysis, name, value)
+        analysis.created_at = datetime.utcnow()
+    else:
+        duplicate = None
+        analysis = Analysis(user_id=current_user.id, **fields)
+        db.add(analysis)
+        db.flush()
+    record(db, analysis, fingerprint, scores, duplicate)
+    # Keep the resume text so the analysis can be rescored later
+    db.merge(AnalysisInput(analysis_id=analysis.id, resume_text=resume_text))
     db.commit()
-    
+
+    if duplicate is not None:
+        return {**scores, "duplicate_of": analysis.id}
     return scores
 
 
@@ -853,6 +1293,110 @@ def get_analysis_detail(
     }
 
 
+# ---- JOB MATCHING ----
+
+class JobCreate(BaseModel):
+    title: str
+    description: str
+    company: Optional[str] = None
+
+
+@app.post("/jobs")
+def create_job(data: JobCreate,
+               authorization: Optional[str] = Header(None),
+               db: Session = Depends(get_db)):
+    """Store a job posting and add it to the matching index (requires auth)"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing token")
+
+    token = authorization.replace("Bearer ", "")
+    user = get_current_user(token, db)
+
+    job = JobPosting(user_id=user.id, title=data.title, company=data.company, description=data.description)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    indexed = job_index.add(job.id, job.description, job.title)
+    return {"id": job.id, "indexed": indexed}
+
+
+@app.delete("/jobs/{job_id}")
+def delete_job(job_id: int,
+               authorization: Optional[str] = Header(None),
+               db: Session = Depends(get_db)):
+    """Delete one of your job postings (requires auth)"""
+    if not authorization or not authorization.startswith("Bearer "):
+        raise HTTPException(status_code=401, detail="Missing token")
+
+    token = authorization.replace("Bearer ", "")
+    user = get_current_user(token, db)
+
+    job = db.query(JobPosting).filter(JobPosting.id == job_id, JobPosting.user_id == user.id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    db.delete(job)
+    db.commit()
+    job_index.remove(job_id)
+    return {"message": "Job deleted"}
+
+
+@app.post("/jobs/match")
+async def match_jobs(data: dict = Body(...)):
+    """Best matching stored jobs for a resume, in /score's breakdown format"""
+    resume_text = data.get("resume") or ""
+    if not resume_text:
+        raise HTTPException(status_code=400, detail="Resume missing")
+    top_k = _top_k(data)
+
+    # Skills extracted under an older taxonomy won't match; rebuild, serving jobs as they reload
+    _refresh_job_index()
+    # The index lives in this process, so this stays on a thread even with CPU_EXECUTOR=process
+    matches = await asyncio.to_thread(job_index.query, resume_text, top_k, data.get("skills"))
+    return [{"job_id": job_id, "title": title, **result} for job_id, title, result in matches]
+
+
+# ---- ADMIN: RESCORING ----
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN")
+
+
+def _require_admin(token: Optional[str]):
+    # No user roles yet: admin endpoints need a shared token and are off without one
+    if not ADMIN_TOKEN or token != ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin token required")
+
+
+@app.post("/admin/rescore")
+def start_rescore_job(x_admin_token: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Recompute every stored analysis score in the background (resumes an unfinished job)"""
+    _require_admin(x_admin_token)
+    try:
+        job = start_rescore(db)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return job_status(job)
+
+
+@app.get("/admin/rescore/{job_id}")
+def rescore_job_status(job_id: int, x_admin_token: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    _require_admin(x_admin_token)
+    job = db.get(RescoreJob, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
+@app.post("/admin/rescore/{job_id}/pause")
+def pause_rescore_job(job_id: int, x_admin_token: Optional[str] = Header(None), db: Session = Depends(get_db)):
+    """Stop after the current batch; POST /admin/rescore resumes from the checkpoint"""
+    _require_admin(x_admin_token)
+    job = pause_rescore(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job_status(job)
+
+
 # ---- RENDER DEPLOYMENT: Bind to PORT environment variable ----
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,61 @@
+# backend/app/minhash.py
+
+import hashlib
+import os
+import zlib
+
+import numpy as np
+
+# Hash functions per signature; the Jaccard estimate's std. error is ~1/sqrt(n)
+MINHASH_PERMUTATIONS = int(os.getenv("MINHASH_PERMUTATIONS", 128))
+
+# Mersenne prime: (a * x + b) stays inside uint64 for a, b, x below it
+_PRIME = (1 << 31) - 1
+
+
+class MinHasher:
+    """MinHash signatures of token sets, for fixed-cost Jaccard estimates."""
+
+    def __init__(self, num_perm: int = MINHASH_PERMUTATIONS, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self._a = rng.integers(1, _PRIME, num_perm, dtype=np.uint64)
+        self._b = rng.integers(0, _PRIME, num_perm, dtype=np.uint64)
+
+    def signature(self, items) -> np.ndarray | None:
+        """uint32 signature of a set of strings, None for an empty set."""
+        items = set(items)
+        if not items:
+            return None
+        # crc32 is stable across processes (signatures are stored), unlike hash()
+        x = np.fromiter((zlib.crc32(i.encode("utf-8")) for i in items), dtype=np.uint64, count=len(items))
+        x %= _PRIME
+        # Chunk so very long texts never build a huge (items x num_perm) matrix
+        sig = np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        for start in range(0, len(x), 4096):
+            chunk = x[start:start + 4096, None]
+            np.minimum(sig, ((chunk * self._a + self._b) % _PRIME).min(axis=0), out=sig)
+        return sig.astype(np.uint32)
+
+    @staticmethod
+    def jaccard(sig1: np.ndarray | None, sig2: np.ndarray | None) -> float:
+        if sig1 is None or sig2 is None:
+            return 0.0
+        return float(np.count_nonzero(sig1 == sig2)) / len(sig1)
+
+
+def lsh_keys(signatures: list[np.ndarray], bands: int) -> list[str]:
+    """One bucket key per band for LSH.
+
+    With several signatures (e.g. resume and JD) each band covers the same
+    rows of all of them, so two items share a bucket only if every
+    signature agrees on that band.
+    """
+    rows = len(signatures[0]) // bands
+    keys = []
+    for band in range(bands):
+        digest = hashlib.blake2b(digest_size=8)
+        for sig in signatures:
+            digest.update(sig[band * rows:(band + 1) * rows].tobytes())
+        keys.append(f"{band}:{digest.hexdigest()}")
+    return keys
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey
+from sqlalchemy import Column, Integer, String, DateTime, Text, Float, ForeignKey, Index, LargeBinary
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -48,3 +48,74 @@ class Analysis(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
 
     owner = relationship("User", back_populates="analyses")
+
+
+# ===============================
+# JOB POSTINGS TABLE
+# ===============================
+class JobPosting(Base):
+    __tablename__ = "job_postings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
+    title = Column(String)
+    company = Column(String, nullable=True)
+    description = Column(Text)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+
+# ===============================
+# ANALYSIS DEDUPLICATION (sidecar tables)
+# ===============================
+class AnalysisSignature(Base):
+    __tablename__ = "analysis_signatures"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), index=True)
+    resume_sig = Column(LargeBinary)   # MinHash of the resume's word shingles
+    jd_sig = Column(LargeBinary)       # MinHash of the JD's word shingles
+    content_key = Column(String, index=True)  # exact resume + JD + scoring inputs' versions
+    result = Column(Text)              # compute_score output as JSON
+    duplicates = Column(Integer, default=0)
+
+
+class AnalysisBucket(Base):
+    __tablename__ = "analysis_lsh_buckets"
+    __table_args__ = (Index("ix_analysis_lsh_user_bucket", "user_id", "bucket"),)
+
+    id = Column(Integer, primary_key=True)
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), index=True)
+    user_id = Column(Integer, ForeignKey("users.id"))
+    bucket = Column(String)
+
+
+# ===============================
+# ANALYSIS INPUTS (sidecar, needed to rescore)
+# ===============================
+class AnalysisInput(Base):
+    __tablename__ = "analysis_inputs"
+
+    analysis_id = Column(Integer, ForeignKey("analyses.id", ondelete="CASCADE"), primary_key=True)
+    resume_text = Column(Text)
+
+
+# ===============================
+# RESCORE JOBS (checkpoints)
+# ===============================
+class RescoreJob(Base):
+    __tablename__ = "rescore_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="pending")  # pending, running, paused, done, failed, superseded
+    cursor = Column(Integer, default=0)         # last analyses.id processed
+    total = Column(Integer, default=0)
+    processed = Column(Integer, default=0)
+    updated = Column(Integer, default=0)
+    skipped = Column(Integer, default=0)        # no stored resume text
+    # What the scores were computed with; a job only resumes under the same versions
+    taxonomy_version = Column(String)
+    scoring_version = Column(String)
+    similarity_version = Column(String)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
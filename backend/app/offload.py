@@ -0,0 +1,172 @@
+# backend/app/offload.py
+
+import asyncio
+import importlib
+import multiprocessing
+import os
+import time
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from . import timing
+
+# thread (shares caches with the API process) or process (true parallelism;
+# functions and arguments must be picklable)
+CPU_EXECUTOR = os.getenv("CPU_EXECUTOR", "thread")
+# Executor size, and how many CPU jobs may run at once
+CPU_WORKERS = int(os.getenv("CPU_WORKERS", 4))
+# Shed load (503) when a new job's expected wait for a slot exceeds this
+CPU_QUEUE_BUDGET_MS = float(os.getenv("CPU_QUEUE_BUDGET_MS", 2000))
+
+_SAMPLES = 1000  # recent queue times kept per stage for percentiles
+
+
+def _warm_up(modules: tuple[str, ...]):
+    for name in modules:
+        importlib.import_module(name)
+
+
+class _StageStats:
+    def __init__(self):
+        self.count = 0
+        self.shed = 0
+        self.queue_ms = deque(maxlen=_SAMPLES)
+        self.run_ms_avg = 0.0  # moving average, also used to predict backlog
+
+    def record(self, queue_ms: float, run_ms: float):
+        self.count += 1
+        self.queue_ms.append(queue_ms)
+        self.run_ms_avg = run_ms if self.count == 1 else 0.9 * self.run_ms_avg + 0.1 * run_ms
+
+    def summary(self) -> dict:
+        q = sorted(self.queue_ms)
+        return {
+            "count": self.count,
+            "shed": self.shed,
+            "queue_ms_p50": round(q[len(q) // 2], 2) if q else 0.0,
+            "queue_ms_p95": round(q[int(len(q) * 0.95)], 2) if q else 0.0,
+            "queue_ms_max": round(q[-1], 2) if q else 0.0,
+            "run_ms_avg": round(self.run_ms_avg, 2),
+        }
+
+
+class CpuLimiter:
+    """Runs CPU-bound stages off the event loop with bounded concurrency.
+
+    A semaphore caps jobs in the executor; jobs beyond it wait in FIFO
+    order. Each admitted job adds its stage's average run time to a backlog
+    estimate, and a job whose expected wait exceeds the budget is refused
+    with 503 before it queues.
+    """
+
+    def __init__(self, workers: int = CPU_WORKERS, budget_ms: float = CPU_QUEUE_BUDGET_MS,
+                 kind: str = CPU_EXECUTOR):
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Unknown CPU_EXECUTOR {kind!r}; use thread or process")
+        self.workers = max(1, workers)
+        self.budget_ms = budget_ms
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._sem: asyncio.Semaphore | None = None
+        self._backlog_ms = 0.0
+        self.running = 0
+        self.waiting = 0
+        self.stages: dict[str, _StageStats] = {}
+
+    def _get_executor(self, preload: tuple[str, ...] = ()) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                ctx = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(
+                    self.workers, mp_context=ctx, initializer=_warm_up, initargs=(preload,)
+                )
+            else:
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="cpu")
+        return self._executor
+
+    def start(self, preload: tuple[str, ...] = ()):
+        """Start process workers and import ``preload`` in each, so the first
+        requests neither wait for spawns nor skew the run-time estimates."""
+        if self.kind != "process":
+            return
+        executor = self._get_executor(preload)
+        # Workers spawn on demand; one task each gets them all started
+        for _ in range(self.workers):
+            executor.submit(time.sleep, 0.5)
+
+    def expected_wait_ms(self) -> float:
+        if self.running + self.waiting < self.workers:
+            return 0.0
+        return self._backlog_ms / self.workers
+
+    def admit(self, stage: str):
+        """Raise 503 if a job for ``stage`` would wait longer than the budget."""
+        if self.budget_ms > 0 and self.expected_wait_ms() > self.budget_ms:
+            self.stages.setdefault(stage, _StageStats()).shed += 1
+            raise HTTPException(status_code=503, detail="Server busy, please retry", headers={"Retry-After": "2"})
+
+    async def run(self, stage: str, func, *args, shed: bool = True):
+        """Run func(*args) in the executor; shed=False queues however long the
+        wait (for callers that bound their own concurrency)."""
+        stats = self.stages.setdefault(stage, _StageStats())
+        if shed:
+            self.admit(stage)
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.workers)
+
+        estimate = stats.run_ms_avg
+        self._backlog_ms += estimate
+        self.waiting += 1
+        queued = time.perf_counter()
+        try:
+            try:
+                await self._sem.acquire()
+            finally:
+                self.waiting -= 1
+            self.running += 1
+            started = time.perf_counter()
+            timing.merge({f"{stage}.queue": (started - queued) * 1000})
+            try:
+                loop = asyncio.get_running_loop()
+                timed = timing.active()
+                job, job_args = (timing.call_timed, (func, *args)) if timed else (func, args)
+                if self.kind == "process":
+                    # Events counted in a worker process come back with the result
+                    result, counts = await loop.run_in_executor(
+                        self._get_executor(), timing.call_counted, job, *job_args
+                    )
+                    timing.merge_counts(counts)
+                else:
+                    result = await loop.run_in_executor(self._get_executor(), job, *job_args)
+                if timed:
+                    # Executor jobs don't see the request's context; bring their stages back
+                    result, stages = result
+                    timing.merge(stages)
+                return result
+            finally:
+                self.running -= 1
+                self._sem.release()
+                stats.record((started - queued) * 1000, (time.perf_counter() - started) * 1000)
+        finally:
+            self._backlog_ms = max(0.0, self._backlog_ms - estimate)
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> dict:
+        return {
+            "executor": self.kind,
+            "workers": self.workers,
+            "running": self.running,
+            "waiting": self.waiting,
+            "expected_wait_ms": round(self.expected_wait_ms(), 2),
+            "budget_ms": self.budget_ms,
+            "stages": {name: s.summary() for name, s in self.stages.items()},
+        }
+
+
+cpu = CpuLimiter()
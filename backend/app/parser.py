@@ -1,11 +1,39 @@
 # backend/app/parser.py
 
+import io
+import os
 import re
-from pathlib import Path
-from tempfile import NamedTemporaryFile
+from functools import cached_property
 
-from pdfminer.high_level import extract_text
-from .skills import SKILLS, SYNONYMS
+from pdfminer.converter import TextConverter
+from pdfminer.layout import LAParams
+from pdfminer.pdfinterp import PDFPageInterpreter, PDFResourceManager
+from pdfminer.pdfpage import PDFPage
+from .timing import stage
+from .sections import SECTION_SCAN_CHARS, Section, segment
+from .similarity import tokenize
+from .skills import SkillTaxonomy, get_taxonomy
+
+# Upper bounds on extraction work per upload (0 disables the limit)
+PDF_MAX_PAGES = int(os.getenv("PDF_MAX_PAGES", 10))
+PDF_MAX_CHARS = int(os.getenv("PDF_MAX_CHARS", 100_000))
+
+# Text-only layout analysis: no vertical text detection, no text from figures,
+# and boxes_flow=None skips the costly hierarchical box grouping in favour of
+# a simple top-to-bottom, left-to-right ordering.
+_LAPARAMS = LAParams(detect_vertical=False, all_texts=False, boxes_flow=None)
+
+# Name extraction strategy:
+#   "auto"  - header-line rules first, spaCy NER only when they find nothing
+#   "spacy" - always use spaCy NER
+#   "rules" - never load spaCy (for memory-constrained deployments)
+NAME_EXTRACTION = os.getenv("NAME_EXTRACTION", "auto").lower()
+# spaCy pipeline for NER: an installed package name or a pipeline directory
+SPACY_MODEL = os.getenv("SPACY_MODEL", "en_core_web_sm")
+
+# Everything in en_core_web_sm except NER; the ner component has its own
+# tok2vec, so none of these are needed to find PERSON entities.
+_SPACY_EXCLUDE = ["tok2vec", "tagger", "parser", "senter", "attribute_ruler", "lemmatizer"]
 
 # Lazy load spaCy model to prevent blocking at startup
 _nlp = None
@@ -15,32 +43,87 @@ def get_nlp():
     if _nlp is None:
         import spacy
         print("Loading spaCy model...")
-        _nlp = spacy.load("en_core_web_sm")
-        print("spaCy model loaded!")
+        _nlp = spacy.load(SPACY_MODEL, exclude=_SPACY_EXCLUDE)
         print("spaCy model loaded!")
     return _nlp
 
 
-def _pdf_bytes_to_text(content: bytes) -> str:
-    """Convert uploaded PDF bytes to text, with a safe fallback."""
-    try:
-        with NamedTemporaryFile(delete=False, suffix=".pdf") as tmp:
-            tmp.write(content)
-            tmp_path = tmp.name
+def _pdf_bytes_to_text(content: bytes, max_pages: int = PDF_MAX_PAGES, max_chars: int = PDF_MAX_CHARS) -> str:
+    """Convert uploaded PDF bytes to text, with a safe fallback.
 
-        text = extract_text(tmp_path) or ""
-        Path(tmp_path).unlink(missing_ok=True)
+    Runs straight from an in-memory buffer and stops after ``max_pages`` pages
+    or once ``max_chars`` characters have been extracted.
+    """
+    try:
+        output = io.StringIO()
+        rsrcmgr = PDFResourceManager(caching=True)
+        device = TextConverter(rsrcmgr, output, laparams=_LAPARAMS)
+        interpreter = PDFPageInterpreter(rsrcmgr, device)
+        try:
+            for page in PDFPage.get_pages(io.BytesIO(content), maxpages=max_pages, caching=True):
+                interpreter.process_page(page)
+                if max_chars and output.tell() >= max_chars:
+                    break
+        finally:
+            device.close()
+        text = output.getvalue()
     except Exception:
         # Fallback: treat bytes as utf-8 text
         text = content.decode("utf-8", errors="ignore")
 
+    if max_chars:
+        text = text[:max_chars]
     return text
 
 
-def extract_name(text: str) -> str | None:
-    """Use spaCy NER to extract candidate person name from top of resume."""
+# A name-like token: "Kabir", "O'Neil", "Jean-Luc", "ROY", or an initial "J."
+_NAME_TOKEN = re.compile(r"^(?:[A-Z][a-zA-Z'\-]+|[A-Z]\.?)$")
+# Title-case header lines that are not names
+_NOT_NAME_WORDS = {
+    "resume", "curriculum", "vitae", "cv", "profile", "summary", "objective",
+    "contact", "experience", "education", "skills", "projects", "about",
+    "engineer", "developer", "manager", "analyst", "scientist", "designer",
+    "consultant", "intern", "student", "architect", "specialist", "lead",
+}
+
+
+def _rule_based_name(text: str) -> str | None:
+    """Cheap check of the first header lines for an obvious "First Last" name."""
+    skill_terms = get_skill_matcher()[1]
+    checked = 0
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        checked += 1
+        if checked > 3:
+            break
+        words = line.split()
+        if not 2 <= len(words) <= 4:
+            continue
+        lowered = [w.lower().strip(".") for w in words]
+        if any(w in _NOT_NAME_WORDS for w in lowered) or all(w in skill_terms for w in lowered):
+            continue
+        if all(_NAME_TOKEN.match(w) for w in words):
+            return line
+    return None
+
+
+def extract_name(text: str, mode: str | None = None) -> str | None:
+    """Extract candidate person name from top of resume.
+
+    Header-line rules handle the common case; spaCy NER is the fallback
+    unless NAME_EXTRACTION (or ``mode``) says otherwise.
+    """
     if not text:
         return None
+    mode = mode or NAME_EXTRACTION
+
+    if mode != "spacy":
+        name = _rule_based_name(text)
+        if name or mode == "rules":
+            return name
+
     nlp = get_nlp()
     doc = nlp(text[:1000])
     for ent in doc.ents:
@@ -49,40 +132,97 @@ def extract_name(text: str) -> str | None:
     return None
 
 
-def extract_skills(text: str) -> list[str]:
-    """Extract skills based on SKILLS + SYNONYMS."""
-    text_low = text.lower()
-    found = set()
+# Characters that may sit on either side of a skill mention
+_BOUNDARY = r"[\s,.\/;:\(\)\[\]]"
+_BOUNDARY_CHARS = frozenset(" \t\n\r\f\v,./;:()[]")
+
+
+def _trie_pattern(terms: list[str]) -> str:
+    """Build a regex alternation shaped like a prefix trie.
+
+    The regex engine then walks each candidate position once instead of
+    retrying every term. Longer branches come first so the longest term that
+    is followed by a boundary wins.
+    """
+    trie: dict = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def _emit(node: dict) -> str:
+        end = "" in node
+        branches = [re.escape(ch) + _emit(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if end:
+            return "(?:" + body + ")?"
+        return body
+
+    return _emit(trie)
+
+
+def _build_skill_matcher(taxonomy: SkillTaxonomy):
+    """Compile the taxonomy's skills + synonyms into one pattern and a term lookup table.
+
+    The pattern reports, at every position preceded by a boundary, the longest
+    term followed by a boundary. Any shorter term matching at the same position
+    must be a prefix of that term whose next character is a boundary, so those
+    are folded into the lookup table up front.
+    """
+    canonical: dict[str, set[str]] = {}
+    for skill in taxonomy.skills:
+        canonical.setdefault(skill, set()).add(skill)
+    for syn, real in taxonomy.synonyms.items():
+        canonical.setdefault(syn, set()).add(real)
+
+    lookup: dict[str, frozenset[str]] = {}
+    for term in canonical:
+        found = set(canonical[term])
+        for i in range(1, len(term)):
+            if term[i] in _BOUNDARY_CHARS and term[:i] in canonical:
+                found |= canonical[term[:i]]
+        lookup[term] = frozenset(found)
+
+    pattern = re.compile(
+        r"(?:^|(?<=" + _BOUNDARY + r"))(?=(" + _trie_pattern(list(canonical)) + r")(?:$|" + _BOUNDARY + r"))"
+    )
+    return pattern, lookup
 
-    # Create a regex pattern for strict matching
-    # Sort skills by length (descending) so 'c++' matches before 'c'
-    all_skills = sorted(SKILLS, key=len, reverse=True)
-    
-    # Escape special regex chars in skills (like c++, c#, .net)
-    # \b matches word boundary. 
-    # For symbols like C++, \b might not work at the end if followed by space, so we use a more complex pattern or just simple whitespace boundaries
-    # A safe pattern for "C++" is (?<!\w)C\+\+(?!\w)
-    
-    # But for simplicity and performance with this list:
-    for skill in all_skills:
-        # Construct pattern: lookbehind/ahead for non-word char, OR start/end of string
-        # We handle the special cases where skill itself contains non-word chars (like c++, .net)
-        
-        s_esc = re.escape(skill.lower())
-        pattern = r'(?:^|[\s,.\/;:\(\)\[\]])' + s_esc + r'(?:$|[\s,.\/;:\(\)\[\]])'
-        
-        if re.search(pattern, text_low):
-            found.add(skill)
-
-    for syn, real in SYNONYMS.items():
-        s_esc = re.escape(syn)
-        pattern = r'(?:^|[\s,.\/;:\(\)\[\]])' + s_esc + r'(?:$|[\s,.\/;:\(\)\[\]])'
-        if re.search(pattern, text_low):
-            found.add(real)
 
+# Built once per taxonomy version; extract_skills does a single scan of the text
+_matcher = (None, None, None)
+
+
+def get_skill_matcher():
+    """(pattern, lookup) for the current taxonomy, rebuilt only when it changes."""
+    global _matcher
+    taxonomy = get_taxonomy()
+    if _matcher[0] != taxonomy.version:
+        _matcher = (taxonomy.version, *_build_skill_matcher(taxonomy))
+    return _matcher[1], _matcher[2]
+
+
+get_skill_matcher()
+
+
+def _match_skills(text_low: str) -> list[str]:
+    pattern, lookup = get_skill_matcher()
+    found = set()
+    # Matches are zero-width, so overlapping mentions ("node.js" -> node, js)
+    # are all reported, just like searching for each term separately.
+    for term in set(pattern.findall(text_low)):
+        found |= lookup[term]
     return sorted(found)
 
 
+def extract_skills(text: str) -> list[str]:
+    """Extract canonical skills (skills + synonyms from the taxonomy)."""
+    return _match_skills(text.lower())
+
+
 def extract_contacts(text: str) -> tuple[list[str], list[str]]:
     """Extract emails + phone numbers with basic cleanup."""
     emails = re.findall(
@@ -105,9 +245,87 @@ def extract_contacts(text: str) -> tuple[list[str], list[str]]:
     return emails_unique, phones_unique
 
 
-def parse_resume(content: bytes) -> dict:
+def extract_snippet(text: str, sections: list[Section] | None = None) -> str:
+    """Short summary of the resume for previews."""
+    sections = segment(text) if sections is None else sections
+    # 1. Prefer the body of a Summary / Profile / Objective section
+    for section in sections:
+        if section.name == "summary":
+            body = text[section.start:section.end].strip()
+            if len(body) >= 50:
+                return body.replace("\n", " ")[:500]
+    # 2. Fallback: First paragraph that looks like specific content
+    lines = []
+    for line in text[:SECTION_SCAN_CHARS].split("\n"):
+        line = line.strip()
+        if len(line) > 40:
+            lines.append(line)
+            if len(lines) == 3:
+                break
+    if lines:
+        return " ".join(lines)[:600]
+    return text[:600].replace("\r", " ").strip()
+
+
+class ResumeDocument:
+    """A resume or JD text with every derived view computed once, on first use.
+
+    Pass the same instance through parsing, scoring, role detection and the
+    rewrite prompt so none of them lowercases or rescans the text again.
     """
-    Main parser entrypoint.
+
+    def __init__(self, text: str | None):
+        self.text = text or ""
+
+    @classmethod
+    def of(cls, value: "ResumeDocument | str | None") -> "ResumeDocument":
+        return value if isinstance(value, cls) else cls(value)
+
+    @cached_property
+    def lower(self) -> str:
+        return self.text.lower()
+
+    @cached_property
+    def tokens(self) -> list[tuple[int, int]]:
+        """(start, end) offsets of word tokens in ``text``."""
+        return [m.span() for m in re.finditer(r"\w+", self.text)]
+
+    @cached_property
+    def terms(self) -> list[str]:
+        """Lowercased word tokens without stop words (similarity input)."""
+        return tokenize(self.lower)
+
+    @cached_property
+    def sections(self) -> list[Section]:
+        """Sections in document order, with offsets into ``text``."""
+        return segment(self.text)
+
+    def section_text(self, *names: str) -> str:
+        """Bodies of the named sections (e.g. "skills", "experience"), in order."""
+        return "\n".join(
+            self.text[s.start:s.end].strip() for s in self.sections if s.name in names
+        )
+
+    @cached_property
+    def skills(self) -> list[str]:
+        return _match_skills(self.lower)
+
+    @cached_property
+    def contacts(self) -> tuple[list[str], list[str]]:
+        return extract_contacts(self.text)
+
+    @cached_property
+    def name(self) -> str | None:
+        return extract_name(self.text)
+
+    @cached_property
+    def snippet(self) -> str:
+        return extract_snippet(self.text, self.sections)
+
+
+def parse_resume(content: "bytes | ResumeDocument") -> dict:
+    """
+    Main parser entrypoint. Accepts raw PDF bytes or an already built document.
 
     Returns:
         {
@@ -119,29 +337,21 @@ def parse_resume(content: bytes) -> dict:
             "full_text": str     # entire extracted resume text
         }
     """
-    text = _pdf_bytes_to_text(content)
-    if not text:
-        text = ""
-
-    name = extract_name(text)
-    emails, phones = extract_contacts(text)
-    skills = extract_skills(text)
-
-    skills = extract_skills(text)
-
-    # Improved Snippet Extraction
-    snippet = ""
-    # 1. Try to find "Summary" or "Profile" header
-    summary_match = re.search(r"(?i)(?:summary|profile|objective|about me)[\s:]+(.{50,500})", text, re.DOTALL)
-    if summary_match:
-        snippet = summary_match.group(1).strip().replace("\n", " ")[:600]
+    if isinstance(content, ResumeDocument):
+        doc = content
     else:
-        # 2. Fallback: First paragraph that looks like specific content
-        lines = [l.strip() for l in text.split('\n') if len(l.strip()) > 40]
-        if lines:
-            snippet = " ".join(lines[:3])[:600]
-        else:
-            snippet = text[:600].replace("\r", " ").strip()
+        with stage("parse.pdf_text"):
+            doc = ResumeDocument(_pdf_bytes_to_text(content))
+    with stage("parse.sections"):
+        doc.sections
+    with stage("parse.skills"):
+        skills = doc.skills
+    with stage("parse.name"):
+        name = doc.name
+    with stage("parse.contacts"):
+        emails, phones = doc.contacts
+    with stage("parse.snippet"):
+        snippet = doc.snippet
 
     return {
         "name": name,
@@ -149,5 +359,5 @@ def parse_resume(content: bytes) -> dict:
         "phones": phones,
         "skills": skills,
         "snippet": snippet,
-        "full_text": text,
+        "full_text": doc.text,
     }
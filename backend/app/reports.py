@@ -0,0 +1,155 @@
+# backend/app/reports.py
+
+import asyncio
+import contextvars
+import os
+import time
+
+from fastapi import HTTPException
+
+from .cache import LRUCache, report_store
+
+# Render jobs worked on at once by this process
+REPORT_RENDER_WORKERS = int(os.getenv("REPORT_RENDER_WORKERS", 2))
+# Jobs that may wait for a render worker before /init-score-download answers 503
+REPORT_QUEUE_SIZE = int(os.getenv("REPORT_QUEUE_SIZE", 100))
+# How long a download of a report still rendering waits for it (seconds)
+REPORT_WAIT_SECONDS = float(os.getenv("REPORT_WAIT_SECONDS", 30))
+
+
+class _RenderJob:
+    def __init__(self, job_id: str, render):
+        self.id = job_id
+        self.render = render
+        self.status = "queued"
+        self.done = asyncio.Event()
+        self.error: str | None = None
+
+
+class RenderQueue:
+    """Report renders queued to a fixed set of worker tasks.
+
+    Jobs are identified by the report id they will store under, so a
+    submit for a report that is queued, rendering or already stored joins
+    it instead of rendering again. Finished reports live in report_store;
+    only queued and running jobs (and recent failures) are tracked here.
+    """
+
+    def __init__(self, workers: int = REPORT_RENDER_WORKERS, max_queued: int = REPORT_QUEUE_SIZE):
+        self.workers = max(1, workers)
+        self.max_queued = max_queued
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+        self._jobs: dict[str, _RenderJob] = {}
+        self._failed = LRUCache(256)
+        self.completed = 0
+        self.failed = 0
+        self.joined = 0
+
+    def _start(self):
+        self._queue = asyncio.Queue()
+        loop = asyncio.get_running_loop()
+        # A fresh context so workers don't inherit the first request's state
+        # (e.g. its stage timings)
+        self._tasks = [
+            loop.create_task(self._work(), context=contextvars.Context())
+            for _ in range(self.workers)
+        ]
+
+    async def _work(self):
+        while True:
+            job = await self._queue.get()
+            job.status = "rendering"
+            try:
+                data = await job.render()
+                await asyncio.to_thread(report_store.put, job.id, data)
+                job.status = "done"
+                self.completed += 1
+            except Exception as e:
+                job.status = "failed"
+                job.error = e.detail if isinstance(e, HTTPException) else str(e)
+                self._failed.put(job.id, job.error)
+                await asyncio.to_thread(report_store.clear_pending, job.id)
+                self.failed += 1
+                print(f"Report render {job.id} failed: {job.error}")
+            finally:
+                self._jobs.pop(job.id, None)
+                job.done.set()
+
+    def status(self, job_id: str) -> dict | None:
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return {"job_id": job_id, "status": job.status}
+        error = self._failed.get(job_id)
+        if error is not None:
+            return {"job_id": job_id, "status": "failed", "error": error}
+        if report_store.exists(job_id):
+            return {"job_id": job_id, "status": "done"}
+        if report_store.is_pending(job_id):
+            # Queued or rendering in another worker on this node
+            return {"job_id": job_id, "status": "rendering"}
+        return None
+
+    async def submit(self, job_id: str, render) -> dict:
+        """Queue ``render`` (an async callable returning PDF bytes) as job_id."""
+        if self._queue is None:
+            self._start()
+        if job_id not in self._jobs and await asyncio.to_thread(report_store.exists, job_id):
+            self.joined += 1
+            return {"job_id": job_id, "status": "done"}
+        # Checked after the await: an identical submit may have queued meanwhile
+        if job_id in self._jobs:
+            self.joined += 1
+            return self.status(job_id)
+        if self._queue.qsize() >= self.max_queued:
+            raise HTTPException(
+                status_code=503,
+                detail="Too many reports waiting to render, please retry",
+                headers={"Retry-After": "5"},
+            )
+        self._failed.pop(job_id)
+        job = self._jobs[job_id] = _RenderJob(job_id, render)
+        self._queue.put_nowait(job)
+        await asyncio.to_thread(report_store.mark_pending, job_id)
+        return {"job_id": job_id, "status": job.status}
+
+    async def wait(self, job_id: str, timeout: float = REPORT_WAIT_SECONDS) -> bool:
+        """Wait for a queued or running job, here or in another worker on the
+        node; False if there is none or it does not finish in time."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            try:
+                await asyncio.wait_for(job.done.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+            return job.status == "done"
+
+        # Rendered elsewhere: poll the shared store until the report lands
+        deadline = time.monotonic() + timeout
+        while await asyncio.to_thread(report_store.is_pending, job_id):
+            if time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(0.2)
+        return await asyncio.to_thread(report_store.exists, job_id)
+
+    def shutdown(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+        self._queue = None
+        self._jobs.clear()
+
+    def stats(self) -> dict:
+        jobs = list(self._jobs.values())
+        return {
+            "workers": self.workers,
+            "queued": sum(1 for j in jobs if j.status == "queued"),
+            "rendering": sum(1 for j in jobs if j.status == "rendering"),
+            "queue_size": self.max_queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "joined": self.joined,
+        }
+
+
+render_queue = RenderQueue()
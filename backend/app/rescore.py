@@ -0,0 +1,235 @@
+# backend/app/rescore.py
+
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+from sqlalchemy import bindparam, func, update
+
+from .database import SessionLocal
+from .dedupe import content_key
+from .models import Analysis, AnalysisInput, AnalysisSignature, RescoreJob
+from .scoring import SCORING_VERSION, jd_features, rank_resumes
+from .similarity import similarity_version
+from .skills import get_taxonomy
+
+# Analyses read, scored and written per transaction
+RESCORE_BATCH_SIZE = int(os.getenv("RESCORE_BATCH_SIZE", 500))
+# Fraction of wall time the job may spend working; it sleeps for the rest
+RESCORE_DUTY_CYCLE = float(os.getenv("RESCORE_DUTY_CYCLE", 0.5))
+# A running job that has not checkpointed for this long is considered dead
+RESCORE_STALE_SECONDS = 120
+
+# Refreshes the stored result /analyze reuses for an exact repeat, and its
+# key, which carries the versions it was scored with; analyses without a
+# signature row are simply not matched
+_update_results = (
+    update(AnalysisSignature.__table__)
+    .where(AnalysisSignature.analysis_id == bindparam("b_id"))
+    .values(result=bindparam("b_result"), content_key=bindparam("b_key"))
+)
+
+# job id -> thread, for jobs running in this process
+_threads: dict[int, threading.Thread] = {}
+# Set on shutdown; jobs stop after their current batch and stay resumable
+_stop = threading.Event()
+
+
+def job_status(job: RescoreJob) -> dict:
+    return {
+        "id": job.id,
+        "status": job.status,
+        "cursor": job.cursor,
+        "total": job.total,
+        "processed": job.processed,
+        "updated": job.updated,
+        "skipped": job.skipped,
+        "progress": round(job.processed / job.total, 4) if job.total else 1.0,
+        "taxonomy_version": job.taxonomy_version,
+        "scoring_version": job.scoring_version,
+        "similarity_version": job.similarity_version,
+        "error": job.error,
+        "updated_at": job.updated_at,
+    }
+
+
+def _is_live(job: RescoreJob) -> bool:
+    thread = _threads.get(job.id)
+    if thread is not None and thread.is_alive():
+        return True
+    # Possibly running in another API process
+    return job.status == "running" and job.updated_at > datetime.utcnow() - timedelta(seconds=RESCORE_STALE_SECONDS)
+
+
+def _score_batch(rows) -> tuple[list[dict], list[dict], int]:
+    """Rescore one batch; rows are (id, job_description, resume_text).
+
+    Returns the Analysis column updates, the new stored results and the
+    number of rows skipped. Rows are grouped by JD so each JD is processed
+    once and its resumes are scored together by rank_resumes.
+    """
+    by_jd = defaultdict(list)
+    skipped = 0
+    for analysis_id, jd_text, resume_text in rows:
+        if not resume_text or not jd_text:
+            skipped += 1
+            continue
+        by_jd[jd_text].append((analysis_id, resume_text))
+
+    updates, results = [], []
+    for jd_text, items in by_jd.items():
+        ranked = rank_resumes([text for _, text in items], jd_features(jd_text), top_k=len(items))
+        for i, scores in ranked:
+            updates.append({
+                "id": items[i][0],
+                "job_title": scores.get("role", "Unknown"),
+                "match_score": scores["final_score"],
+                "skill_score": scores["skill_score"],
+                "semantic_score": scores["jd_similarity_score"],
+                "missing_skills": json.dumps(scores.get("missing_skills", [])),
+                "bonus_skills": json.dumps(scores.get("resume_extra_skills", [])),
+            })
+            results.append({
+                "b_id": items[i][0],
+                "b_result": json.dumps(scores),
+                "b_key": content_key(items[i][1], jd_text),
+            })
+    return updates, results, skipped
+
+
+def run_rescore(job_id: int):
+    """Process analyses after the job's cursor until done, paused or stopped.
+
+    Reads use a server-side cursor (stream_results + yield_per) on one
+    session; each batch's score updates and the checkpoint are committed
+    together on another, so a restart resumes from the last full batch.
+    """
+    reader = SessionLocal()
+    writer = SessionLocal()
+    job = writer.get(RescoreJob, job_id)
+    try:
+        rows = (
+            reader.query(Analysis.id, Analysis.job_description, AnalysisInput.resume_text)
+            .outerjoin(AnalysisInput, AnalysisInput.analysis_id == Analysis.id)
+            .filter(Analysis.id > job.cursor)
+            .order_by(Analysis.id)
+            .execution_options(stream_results=True, yield_per=RESCORE_BATCH_SIZE)
+        )
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) < RESCORE_BATCH_SIZE:
+                continue
+            if not _process(writer, job, batch):
+                return
+            batch = []
+            if _stop.is_set():
+                return
+        if batch and not _process(writer, job, batch):
+            return
+        job.status = "done"
+        job.updated_at = datetime.utcnow()
+        writer.commit()
+        print(f"Rescore job {job.id} done: {job.updated} updated, {job.skipped} skipped")
+    except Exception as e:
+        writer.rollback()
+        job = writer.get(RescoreJob, job_id)
+        job.status = "failed"
+        job.error = str(e)
+        job.updated_at = datetime.utcnow()
+        writer.commit()
+        print(f"Rescore job {job_id} failed: {e}")
+    finally:
+        reader.close()
+        writer.close()
+        _threads.pop(job_id, None)
+
+
+def _process(writer, job: RescoreJob, batch) -> bool:
+    """Score, write and checkpoint one batch, then throttle. False once paused."""
+    start = time.perf_counter()
+    updates, results, skipped = _score_batch(batch)
+    if updates:
+        writer.execute(update(Analysis), updates)
+        writer.execute(_update_results, results)
+    job.cursor = batch[-1][0]
+    job.processed += len(batch)
+    job.updated += len(updates)
+    job.skipped += skipped
+    job.updated_at = datetime.utcnow()
+    writer.commit()
+
+    writer.refresh(job)
+    if job.status != "running":  # paused through the API
+        return False
+    # Sleep so work takes at most RESCORE_DUTY_CYCLE of wall time
+    busy = time.perf_counter() - start
+    if 0 < RESCORE_DUTY_CYCLE < 1:
+        time.sleep(busy * (1 - RESCORE_DUTY_CYCLE) / RESCORE_DUTY_CYCLE)
+    return True
+
+
+def _versions() -> dict:
+    return {
+        "taxonomy_version": get_taxonomy().version,
+        "scoring_version": SCORING_VERSION,
+        "similarity_version": similarity_version(),
+    }
+
+
+def start_rescore(db) -> RescoreJob:
+    """Resume the latest unfinished job, or create one, and run it in a thread.
+
+    A job only resumes if the taxonomy, scoring and similarity versions are
+    the ones it started with; otherwise rows before its cursor hold scores
+    from the old versions, so it is superseded by a new job from the start.
+    Raises ValueError if a job is already running.
+    """
+    job = (
+        db.query(RescoreJob)
+        .filter(RescoreJob.status.in_(["pending", "running", "paused", "failed"]))
+        .order_by(RescoreJob.id.desc())
+        .first()
+    )
+    if job is not None and _is_live(job):
+        raise ValueError(f"Rescore job {job.id} is already running")
+    versions = _versions()
+    if job is not None and any(getattr(job, name) != value for name, value in versions.items()):
+        print(f"Rescore job {job.id} superseded: versions changed since it started")
+        job.status = "superseded"
+        job.updated_at = datetime.utcnow()
+        job = None
+    if job is None:
+        job = RescoreJob(status="pending", cursor=0, **versions)
+        db.add(job)
+
+    job.total = db.query(func.count(Analysis.id)).scalar()
+    job.processed = db.query(func.count(Analysis.id)).filter(Analysis.id <= job.cursor).scalar()
+    job.status = "running"
+    job.error = None
+    job.updated_at = datetime.utcnow()
+    db.commit()
+    db.refresh(job)
+
+    thread = threading.Thread(target=run_rescore, args=(job.id,), name=f"rescore-{job.id}", daemon=True)
+    _threads[job.id] = thread
+    thread.start()
+    return job
+
+
+def stop_rescores():
+    _stop.set()
+    for thread in list(_threads.values()):
+        thread.join(timeout=5)
+
+
+def pause_rescore(db, job_id: int) -> RescoreJob | None:
+    job = db.get(RescoreJob, job_id)
+    if job is not None and job.status == "running":
+        job.status = "paused"
+        job.updated_at = datetime.utcnow()
+        db.commit()
+    return job
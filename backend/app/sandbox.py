@@ -0,0 +1,191 @@
+# backend/app/sandbox.py
+
+import asyncio
+import multiprocessing
+import os
+
+from . import timing
+
+# Wall-clock limit for one parse job (seconds)
+PARSE_TIMEOUT = float(os.getenv("PARSE_TIMEOUT", 30))
+# Address-space limit for each parse process in MB (0 = unlimited)
+PARSE_MEMORY_LIMIT_MB = int(os.getenv("PARSE_MEMORY_LIMIT_MB", 1536))
+# Replace a worker after this many jobs to cap heap fragmentation (0 = never)
+PARSE_MAX_JOBS_PER_WORKER = int(os.getenv("PARSE_MAX_JOBS_PER_WORKER", 200))
+
+
+class SandboxError(Exception):
+    """The parse process timed out or died; the input should be rejected."""
+
+
+class JobError(Exception):
+    """The job raised an ordinary exception inside the worker."""
+
+
+def _worker_main(conn, memory_limit_mb: int):
+    """Child process loop: receive (job, args, timed), reply (status, payload, timings)."""
+    if memory_limit_mb > 0:
+        import resource
+        limit = memory_limit_mb * 1024 * 1024
+        resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+    from . import parser
+    if parser.NAME_EXTRACTION != "rules":
+        try:
+            parser.get_nlp()
+        except Exception as e:
+            print(f"Parse worker could not preload spaCy: {e}")
+
+    jobs = {
+        "parse_resume": parser.parse_resume,
+    }
+
+    while True:
+        try:
+            message = conn.recv()
+        except (EOFError, KeyboardInterrupt):
+            return
+        if message is None:
+            return
+        job, args, timed = message
+        try:
+            if timed:
+                conn.send(("ok", *timing.call_timed(jobs[job], *args)))
+            else:
+                conn.send(("ok", jobs[job](*args), None))
+        except MemoryError:
+            # State after a MemoryError is not trustworthy; report and exit
+            conn.send(("killed", "memory limit reached", None))
+            return
+        except Exception as e:
+            conn.send(("error", str(e), None))
+
+
+class _Worker:
+    def __init__(self, ctx, memory_limit_mb: int):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(
+            target=_worker_main, args=(child_conn, memory_limit_mb), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.jobs = 0
+
+    def stop(self, graceful: bool = True):
+        try:
+            if graceful and self.process.is_alive():
+                self.conn.send(None)
+                self.process.join(timeout=1)
+        except OSError:
+            pass
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join(timeout=1)
+        self.conn.close()
+
+
+class SandboxPool:
+    """Fixed set of supervised parse processes.
+
+    Each job runs in a child with RLIMIT_AS applied and a wall-clock timeout;
+    a child that times out or dies is killed and replaced, and children are
+    recycled after ``max_jobs`` jobs.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        timeout: float = PARSE_TIMEOUT,
+        memory_limit_mb: int = PARSE_MEMORY_LIMIT_MB,
+        max_jobs: int = PARSE_MAX_JOBS_PER_WORKER,
+    ):
+        self.size = size
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self.max_jobs = max_jobs
+        # spawn keeps workers free of the API process's state (sockets, DB pool)
+        self._ctx = multiprocessing.get_context("spawn")
+        self._idle: asyncio.Queue | None = None
+        self.timeouts = 0
+        self.crashes = 0
+        self.recycled = 0
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._ctx, self.memory_limit_mb)
+
+    def _start(self):
+        print(f"Starting {self.size} sandboxed parse workers...")
+        self._idle = asyncio.Queue()
+        for _ in range(self.size):
+            self._idle.put_nowait(self._spawn())
+
+    async def _call(self, worker: _Worker, job: str, args: tuple):
+        loop = asyncio.get_running_loop()
+        ready = loop.create_future()
+        fd = worker.conn.fileno()
+        loop.add_reader(fd, lambda: ready.done() or ready.set_result(None))
+        try:
+            await asyncio.to_thread(worker.conn.send, (job, args, timing.active()))
+            await asyncio.wait_for(ready, self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise SandboxError(f"parsing took longer than {self.timeout:g}s")
+        except OSError:
+            self.crashes += 1
+            raise SandboxError("parse worker exited unexpectedly")
+        finally:
+            loop.remove_reader(fd)
+
+        try:
+            status, payload, stages = worker.conn.recv()
+        except (EOFError, OSError):
+            # Killed mid-job: RLIMIT_AS abort, OOM killer, segfault in a C extension...
+            self.crashes += 1
+            raise SandboxError("parse worker was killed (likely out of memory)")
+        if status == "killed":
+            self.crashes += 1
+            raise SandboxError(payload)
+        if status == "error":
+            raise JobError(payload)
+        timing.merge(stages)
+        return payload
+
+    async def run(self, job: str, *args):
+        if self._idle is None:
+            self._start()
+        worker = await self._idle.get()
+        failed = True
+        try:
+            result = await self._call(worker, job, args)
+            failed = False
+        except JobError:
+            failed = False
+            raise
+        finally:
+            # On timeout, crash or cancellation the child may still be busy:
+            # kill it rather than hand it to the next job.
+            worker.jobs += 1
+            recycle = not failed and self.max_jobs and worker.jobs >= self.max_jobs
+            if failed or recycle:
+                self.recycled += bool(recycle)
+                # Stopping may block briefly on join; keep it off the event loop
+                asyncio.get_running_loop().run_in_executor(None, worker.stop, not failed)
+                worker = self._spawn()
+            self._idle.put_nowait(worker)
+        return result
+
+    def shutdown(self):
+        if self._idle is None:
+            return
+        while not self._idle.empty():
+            self._idle.get_nowait().stop()
+        self._idle = None
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.size,
+            "idle": self._idle.qsize() if self._idle is not None else 0,
+            "timeouts": self.timeouts,
+            "crashes": self.crashes,
+            "recycled": self.recycled,
+        }
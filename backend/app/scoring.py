@@ -0,0 +1,265 @@
+# backend/app/scoring.py
+
+import hashlib
+from dataclasses import dataclass
+
+import numpy as np
+from scipy import sparse
+
+from .cache import jd_cache
+from .parser import ResumeDocument
+from .similarity import batch_similarity, get_similarity, get_similarity_engine
+from .skills import get_taxonomy
+from .timing import count, stage
+
+# Bump when the score formula changes; stored results keyed with it stop being reused
+SCORING_VERSION = "1"
+
+
+def _detect_role(jd: ResumeDocument | str) -> str:
+    jd_low = ResumeDocument.of(jd).lower
+    jd_len = len(jd_low)
+
+    # If JD is too short, don't guess a specific role
+    if jd_len < 40:
+        return "Generic / Undefined Role"
+
+    best_role = "General Software Engineer"
+    best_hits = 0
+    for role, keywords in get_taxonomy().roles.items():
+        hits = sum(1 for kw in keywords if kw in jd_low)
+        if hits > best_hits:
+            best_hits = hits
+            best_role = role
+
+    # If no specific keywords matched despite reasonable length, call it general
+    if best_hits == 0:
+        return "Software Professional" if jd_len < 300 else "General Software Engineer"
+
+    return best_role
+
+
+@dataclass(frozen=True)
+class JDFeatures:
+    """What scoring needs from a JD, computed once and shared across resumes."""
+    doc: ResumeDocument
+    skills: frozenset[str]
+    role: str
+    len_mult: float
+    quality_multiplier: float
+    prepared: object = None  # the similarity engine's prepare() of the JD
+
+    @property
+    def too_short(self) -> bool:
+        # Extremely short JDs with no detected skills always score 0
+        return len(self.doc.lower) < 10 and not self.skills
+
+
+def jd_features(jd: ResumeDocument | str) -> JDFeatures:
+    jd_doc = ResumeDocument.of(jd)
+    with stage("jd.skills"):
+        jd_skills = frozenset(jd_doc.skills)
+
+    # JD Depth Penalty (Prevents inflated scores for low-effort or single-word JDs)
+    jd_len = len(jd_doc.lower)
+    jd_skill_count = len(jd_skills)
+
+    # Length Multiplier
+    if jd_len < 50: len_mult = 0.2
+    elif jd_len < 200: len_mult = 0.5
+    elif jd_len < 600: len_mult = 0.85
+    else: len_mult = 1.0
+
+    # Skill Density Multiplier
+    if jd_skill_count == 0: skill_mult = 0.0
+    elif jd_skill_count == 1: skill_mult = 0.35
+    elif jd_skill_count == 2: skill_mult = 0.65
+    elif jd_skill_count <= 4: skill_mult = 0.9
+    else: skill_mult = 1.0
+
+    # Final quality multiplier (weighted average)
+    quality_multiplier = (len_mult * 0.4) + (skill_mult * 0.6)
+
+    with stage("jd.role"):
+        role = _detect_role(jd_doc)
+    with stage("jd.prepare"):
+        prepared = get_similarity_engine().prepare(jd_doc)
+    return JDFeatures(jd_doc, jd_skills, role, len_mult, quality_multiplier, prepared)
+
+
+def get_jd_features(jd_text: ResumeDocument | str | None) -> JDFeatures:
+    """jd_features through the shared LRU, keyed by a hash of the normalized JD.
+
+    Every feature is derived from the lowercased text, so JDs differing only
+    in case share an entry; the taxonomy version is part of the key because
+    skills depend on it.
+    """
+    jd_doc = ResumeDocument.of(jd_text)
+    key = f"{hashlib.sha256(jd_doc.lower.encode()).hexdigest()}-{get_taxonomy().version}"
+    features = jd_cache.get(key)
+    if features is None:
+        features = jd_features(jd_doc)
+        jd_cache.put(key, features)
+    return features
+
+
+def _empty_score() -> dict:
+    return {
+        "final_score": 0.0,
+        "skill_score": 0.0,
+        "jd_similarity_score": 0.0,
+        "similarity_raw": 0.0,
+        "matched_jd_skills": [],
+        "missing_skills": [],
+        "resume_extra_skills": [],
+        "role": "Unknown",
+    }
+
+
+def _breakdown(jd: JDFeatures, resume_skills: set[str], similarity: float) -> dict:
+    """Score breakdown for one resume, given its skills and clamped similarity."""
+    matched_jd_skills = sorted(s for s in jd.skills if s in resume_skills)
+    missing_skills = sorted(s for s in jd.skills if s not in resume_skills)
+    resume_extra_skills = sorted(s for s in resume_skills if s not in jd.skills)
+
+    # SCORING LOGIC
+    # 1. Skill Match (Primary Factor)
+    if jd.skills:
+        coverage = len(matched_jd_skills) / len(jd.skills)
+    else:
+        coverage = 0.0
+
+    skill_score = coverage * 75.0  # Max 75 points from skills
+
+    # 2. Semantic Similarity (Secondary Factor)
+    # If JD has no skills, rely more on semantic but penalize valid "tech" comparison
+    if not jd.skills:
+        if similarity < 0.5:
+            jd_score = 0.0
+        else:
+            jd_score = similarity * 50.0
+    else:
+        jd_score = similarity * 25.0
+
+    # 3. Apply the JD Depth Penalty to both scores
+    skill_score = skill_score * jd.quality_multiplier
+    jd_score = jd_score * jd.len_mult
+
+    final_score = round(skill_score + jd_score, 2)
+
+    # Cap at 100
+    final_score = min(100.0, final_score)
+
+    return {
+        "final_score": float(final_score),
+        "skill_score": float(round(skill_score, 2)),
+        "jd_similarity_score": float(round(jd_score, 2)),
+        "similarity_raw": float(round(similarity, 4)),
+        "matched_jd_skills": matched_jd_skills,
+        "missing_skills": missing_skills,
+        "resume_extra_skills": resume_extra_skills,
+        "role": jd.role,
+    }
+
+
+def compute_score(
+    resume: ResumeDocument | str,
+    jd: JDFeatures | ResumeDocument | str,
+    resume_skills_input: list[str] | None = None,
+) -> dict:
+    """Compute match score between resume and JD.
+
+    Accepts plain text or ResumeDocument; passing documents (or JDFeatures for
+    the JD) lets callers reuse skills and normalized text already computed.
+    """
+    resume_doc = ResumeDocument.of(resume)
+    jd = jd if isinstance(jd, JDFeatures) else jd_features(jd)
+    resume_skills_input = resume_skills_input or []
+
+    if not resume_doc.text or not jd.doc.text:
+        return {"error": "Resume or JD missing"}
+
+    if jd.too_short:
+        return _empty_score()
+
+    with stage("score.skills"):
+        resume_skills: set[str] = set(s.lower() for s in resume_skills_input)
+        if not resume_skills:
+            resume_skills = set(resume_doc.skills)
+
+    try:
+        with stage("score.similarity"):
+            similarity = get_similarity(resume_doc, jd.doc, jd.prepared)
+        # Clamp between 0 and 1
+        similarity = max(0.0, min(1.0, similarity))
+    except Exception as e:
+        # Score on skills alone rather than fail the request, but leave a trace
+        print(f"Similarity error: {e!r}")
+        count("similarity.fallback")
+        similarity = 0.0
+
+    with stage("score.breakdown"):
+        return _breakdown(jd, resume_skills, similarity)
+
+
+def rank_resumes(
+    resumes: list[ResumeDocument | str],
+    jd: JDFeatures | ResumeDocument | str,
+    top_k: int = 10,
+    resume_skills: list[list[str] | None] | None = None,
+) -> list[tuple[int, dict]]:
+    """Score many resumes against one JD and return the top_k as (index, breakdown).
+
+    The JD is processed once; skill coverage and similarity for all resumes
+    are computed with sparse matrix products. Breakdowns match compute_score.
+    Resumes with no text are left out of the ranking.
+    """
+    jd = jd if isinstance(jd, JDFeatures) else jd_features(jd)
+    docs = [ResumeDocument.of(r) for r in resumes]
+    keep = [i for i, d in enumerate(docs) if d.text]
+    if not jd.doc.text or not keep:
+        return []
+    if jd.too_short:
+        return [(i, _empty_score()) for i in keep[:top_k]]
+
+    docs = [docs[i] for i in keep]
+    overrides = resume_skills or [None] * len(resumes)
+    skill_sets = []
+    with stage("rank.skills"):
+        for i, doc in zip(keep, docs):
+            given = set(s.lower() for s in overrides[i] or [])
+            skill_sets.append(given or set(doc.skills))
+
+    # Resume x taxonomy-skill indicator matrix; matched count = S @ jd_skills
+    skill_ids = get_taxonomy().skill_ids
+    indptr, indices = [0], []
+    for skills in skill_sets:
+        indices.extend(skill_ids[s] for s in skills if s in skill_ids)
+        indptr.append(len(indices))
+    S = sparse.csr_matrix(
+        (np.ones(len(indices)), indices, indptr), shape=(len(docs), len(skill_ids))
+    )
+    jd_vec = np.zeros(len(skill_ids))
+    jd_vec[[skill_ids[s] for s in jd.skills]] = 1.0
+    matched = S @ jd_vec
+
+    try:
+        with stage("rank.similarity"):
+            similarity = np.clip(batch_similarity(docs, jd.doc, jd.prepared), 0.0, 1.0)
+    except Exception as e:
+        print(f"Similarity error: {e!r}")
+        count("similarity.fallback", len(docs))
+        similarity = np.zeros(len(docs))
+
+    # Same arithmetic as _breakdown, for every resume at once
+    coverage = matched / len(jd.skills) if jd.skills else np.zeros(len(docs))
+    skill_score = coverage * 75.0 * jd.quality_multiplier
+    if jd.skills:
+        jd_score = similarity * 25.0
+    else:
+        jd_score = np.where(similarity < 0.5, 0.0, similarity * 50.0)
+    final = np.minimum(100.0, skill_score + jd_score * jd.len_mult)
+
+    top = np.argsort(-final, kind="stable")[:top_k]
+    with stage("rank.breakdown"):
+        return [(keep[j], _breakdown(jd, skill_sets[j], float(similarity[j]))) for j in top]
@@ -0,0 +1,97 @@
+# backend/app/sections.py
+
+import os
+from dataclasses import dataclass
+
+# Only this many characters are scanned for headings; anything after the
+# limit stays in the last section so huge inputs cost a bounded amount of work.
+SECTION_SCAN_CHARS = int(os.getenv("SECTION_SCAN_CHARS", 200_000))
+# Longer lines are never treated as headings
+MAX_HEADING_LEN = 40
+
+# Heading as written (lowercased, punctuation stripped) -> canonical section name
+SECTION_ALIASES = {
+    "summary": "summary",
+    "professional summary": "summary",
+    "career summary": "summary",
+    "profile": "summary",
+    "professional profile": "summary",
+    "objective": "summary",
+    "career objective": "summary",
+    "about me": "summary",
+    "experience": "experience",
+    "work experience": "experience",
+    "professional experience": "experience",
+    "employment": "experience",
+    "employment history": "experience",
+    "work history": "experience",
+    "internships": "experience",
+    "education": "education",
+    "academic background": "education",
+    "qualifications": "education",
+    "skills": "skills",
+    "technical skills": "skills",
+    "core competencies": "skills",
+    "key skills": "skills",
+    "tech stack": "skills",
+    "projects": "projects",
+    "personal projects": "projects",
+    "key projects": "projects",
+    "certifications": "certifications",
+    "certificates": "certifications",
+    "achievements": "achievements",
+    "awards": "achievements",
+    "publications": "publications",
+}
+
+_HEADING_STRIP = " \t\r:-–—|•*#_=."
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str       # canonical name, "header" for text before the first heading
+    heading: str    # heading line as written ("" for the header block)
+    start: int      # offset of the section body in the text
+    end: int
+
+
+def _heading_at(line: str, line_len: int) -> tuple[str, int] | None:
+    """(canonical name, body offset within line) if the line opens a section.
+
+    ``line`` is at most MAX_HEADING_LEN characters of a line of ``line_len``.
+    Handles both a heading on its own line ("EXPERIENCE") and an inline one
+    ("Summary: Results-driven engineer ...").
+    """
+    if line_len <= MAX_HEADING_LEN:
+        name = SECTION_ALIASES.get(" ".join(line.strip(_HEADING_STRIP).lower().split()))
+        if name:
+            return name, line_len
+    colon = line.find(":")
+    if colon > 0:
+        name = SECTION_ALIASES.get(" ".join(line[:colon].strip(_HEADING_STRIP).lower().split()))
+        if name:
+            return name, colon + 1
+    return None
+
+
+def segment(text: str, scan_chars: int = SECTION_SCAN_CHARS) -> list[Section]:
+    """Split text into sections with one left-to-right pass over its lines."""
+    sections: list[Section] = []
+    name, heading, body_start = "header", "", 0
+    limit = min(len(text), scan_chars)
+    pos = 0
+
+    while pos < limit:
+        nl = text.find("\n", pos)
+        line_end = len(text) if nl == -1 else nl
+        found = _heading_at(text[pos:min(line_end, pos + MAX_HEADING_LEN)], line_end - pos)
+        if found:
+            if pos > body_start or name != "header":
+                sections.append(Section(name, heading, body_start, pos))
+            name, offset = found
+            heading = text[pos:pos + offset].strip(_HEADING_STRIP)
+            body_start = pos + offset
+        pos = line_end + 1
+
+    sections.append(Section(name, heading, body_start, len(text)))
+    return sections
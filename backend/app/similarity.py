@@ -0,0 +1,399 @@
+# backend/app/similarity.py
+
+import hashlib
+import json
+import math
+import os
+import re
+import zlib
+from array import array
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+from scipy import sparse
+
+from .minhash import MinHasher
+
+_DATA_DIR = Path(__file__).parent / "data"
+
+# IDF weights fitted offline by fit_idf.py on a corpus of JDs and resumes
+IDF_MODEL_PATH = os.getenv("IDF_MODEL_PATH", str(_DATA_DIR / "idf_model.json"))
+# tfidf (cosine), bm25 or minhash (Jaccard estimate of the term sets)
+SIMILARITY_BACKEND = os.getenv("SIMILARITY_BACKEND", "tfidf")
+
+# Same tokenization as scikit-learn's default TfidfVectorizer
+_TOKEN = re.compile(r"(?u)\b\w\w+\b")
+
+
+def _load_stop_words() -> frozenset[str]:
+    lines = (_DATA_DIR / "stop_words.txt").read_text(encoding="utf-8").splitlines()
+    return frozenset(w.strip() for w in lines if w.strip() and not w.startswith("#"))
+
+
+STOP_WORDS = _load_stop_words()
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens with English stop words removed."""
+    return [t for t in _TOKEN.findall(text.lower()) if t not in STOP_WORDS]
+
+
+def hash_term(term: str, n_features: int) -> int:
+    # crc32 is stable across processes, unlike hash()
+    return zlib.crc32(term.encode("utf-8")) % n_features
+
+
+class IdfModel:
+    """Fitted IDF weights; turns token lists into L2-normalized sparse vectors.
+
+    Two storage modes:
+      - vocabulary: term -> idf, unseen terms get the maximum idf
+      - hashing:    idf per hash bucket, fixed memory of n_features floats
+    """
+
+    def __init__(self, n_docs: int, idf: dict[str, float] | None = None,
+                 hashed_idf: array | None = None, avg_len: float = 0.0, version: str = ""):
+        self.n_docs = n_docs
+        self.version = version  # content hash of the loaded artifact
+        self.avg_len = avg_len  # mean tokens per document, used by BM25
+        self.idf = idf
+        self.hashed_idf = hashed_idf
+        self.n_features = len(hashed_idf) if hashed_idf is not None else 0
+        # idf of a term seen in no document (smooth_idf, as in scikit-learn)
+        self.default_idf = math.log((1 + n_docs) / 1) + 1
+
+    @property
+    def hashing(self) -> bool:
+        return self.hashed_idf is not None
+
+    @staticmethod
+    def smooth_idf(n_docs: int, df: int) -> float:
+        return math.log((1 + n_docs) / (1 + df)) + 1
+
+    @classmethod
+    def fit(cls, docs, n_features: int = 0, min_df: int = 1) -> "IdfModel":
+        """Fit on an iterable of token lists. n_features > 0 selects hashing mode."""
+        n_docs = 0
+        total_len = 0
+        df: Counter = Counter()
+        for tokens in docs:
+            n_docs += 1
+            total_len += len(tokens)
+            if n_features:
+                df.update({hash_term(t, n_features) for t in tokens})
+            else:
+                df.update(set(tokens))
+
+        if n_features:
+            hashed = array("f", [cls.smooth_idf(n_docs, 0)] * n_features)
+            for bucket, count in df.items():
+                hashed[bucket] = cls.smooth_idf(n_docs, count)
+            return cls(n_docs, hashed_idf=hashed, avg_len=total_len / max(n_docs, 1))
+
+        idf = {t: cls.smooth_idf(n_docs, c) for t, c in df.items() if c >= min_df}
+        return cls(n_docs, idf=idf, avg_len=total_len / max(n_docs, 1))
+
+    def term_idf(self, term: str) -> float:
+        if self.hashing:
+            return self.hashed_idf[hash_term(term, self.n_features)]
+        return self.idf.get(term, self.default_idf)
+
+    def doc_freq(self, term: str) -> float:
+        """Document frequency recovered from the stored smooth idf."""
+        return (1 + self.n_docs) / math.exp(self.term_idf(term) - 1) - 1
+
+    def vectorize(self, tokens: list[str]) -> dict:
+        """Sparse tf-idf vector {term or bucket: weight}, L2-normalized."""
+        if self.hashing:
+            counts = Counter(hash_term(t, self.n_features) for t in tokens)
+            vec = {b: c * self.hashed_idf[b] for b, c in counts.items()}
+        else:
+            counts = Counter(tokens)
+            vec = {t: c * self.idf.get(t, self.default_idf) for t, c in counts.items()}
+        norm = math.sqrt(sum(w * w for w in vec.values()))
+        if norm:
+            for k in vec:
+                vec[k] /= norm
+        return vec
+
+    def save(self, path: str):
+        data = {"n_docs": self.n_docs, "avg_len": round(self.avg_len, 2)}
+        if self.hashing:
+            data.update(mode="hashing", idf=[round(x, 5) for x in self.hashed_idf])
+        else:
+            data.update(mode="vocabulary", idf={t: round(v, 5) for t, v in sorted(self.idf.items())})
+        Path(path).write_text(json.dumps(data, separators=(",", ":")), encoding="utf-8")
+
+    @classmethod
+    def load(cls, path: str) -> "IdfModel":
+        raw = Path(path).read_bytes()
+        data = json.loads(raw)
+        avg_len = data.get("avg_len", 0.0)
+        version = hashlib.sha256(raw).hexdigest()[:12]
+        if data["mode"] == "hashing":
+            return cls(data["n_docs"], hashed_idf=array("f", data["idf"]), avg_len=avg_len, version=version)
+        return cls(data["n_docs"], idf=data["idf"], avg_len=avg_len, version=version)
+
+
+def sparse_dot(a: dict, b: dict) -> float:
+    if len(a) > len(b):
+        a, b = b, a
+    return sum(w * b.get(k, 0.0) for k, w in a.items())
+
+
+# Lazy load the IDF artifact; False means "looked, not there"
+_idf_model = None
+
+
+def get_idf_model() -> IdfModel | None:
+    global _idf_model
+    if _idf_model is None:
+        try:
+            _idf_model = IdfModel.load(IDF_MODEL_PATH)
+            print(f"IDF model loaded ({_idf_model.n_docs} docs)")
+        except FileNotFoundError:
+            print(f"No IDF model at {IDF_MODEL_PATH}; weighting terms per pair (run fit_idf.py)")
+            _idf_model = False
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            # Truncated or corrupt artifact: say so once, don't retry per request
+            print(f"Unreadable IDF model at {IDF_MODEL_PATH} ({e!r}); weighting terms per pair (re-run fit_idf.py)")
+            _idf_model = False
+    return _idf_model or None
+
+
+# ResumeDocument caches its tokens; plain strings are tokenized here
+def _terms(doc) -> list[str]:
+    return doc.terms if hasattr(doc, "terms") else tokenize(doc)
+
+
+class SimilarityEngine:
+    """How similar a document is to a query document (the JD), in [0, 1].
+
+    Both sides are reduced to a representation first: prepare() for the
+    query, represent() for the document. A JD's prepared form is what
+    JDFeatures caches; a resume's representation can be compared with many
+    JDs without being rebuilt.
+    """
+
+    name = ""
+
+    def prepare(self, query):
+        raise NotImplementedError
+
+    def represent(self, doc):
+        raise NotImplementedError
+
+    def compare(self, rep, prepared) -> float:
+        raise NotImplementedError
+
+    def score(self, doc, prepared) -> float:
+        return self.compare(self.represent(doc), prepared)
+
+    def batch(self, docs: list, prepared) -> np.ndarray:
+        return np.array([self.score(doc, prepared) for doc in docs], dtype=np.float64)
+
+
+# With two documents, smooth idf is 1 for shared terms and this for the rest
+PAIR_IDF = math.log(3 / 2) + 1
+
+
+class _TfidfQuery:
+    __slots__ = ("counts", "sq_norm", "vector")
+
+    def __init__(self, counts: Counter, vector: dict | None):
+        self.counts = counts
+        self.sq_norm = float(sum(c * c for c in counts.values()))
+        self.vector = vector
+
+
+def _count_rows(term_lists, column) -> tuple[list, list, list]:
+    """CSR (data, indices, indptr) of term counts; column(term) gives the column."""
+    data, indices, indptr = [], [], [0]
+    for terms in term_lists:
+        counts = Counter(column(t) for t in terms)
+        indices.extend(counts.keys())
+        data.extend(counts.values())
+        indptr.append(len(indices))
+    return data, indices, indptr
+
+
+class TfidfEngine(SimilarityEngine):
+    """TF-IDF cosine. Uses the fitted IDF artifact when there is one.
+
+    Without it, scores equal fitting scikit-learn's TfidfVectorizer on just
+    the two texts; that fit is computed in closed form (shared terms get
+    idf 1, the rest PAIR_IDF), so sklearn is never imported.
+    """
+
+    name = "tfidf"
+
+    def prepare(self, query) -> _TfidfQuery:
+        model = get_idf_model()
+        terms = _terms(query)
+        return _TfidfQuery(Counter(terms), model.vectorize(terms) if model is not None else None)
+
+    def represent(self, doc) -> _TfidfQuery:
+        return self.prepare(doc)
+
+    def compare(self, rep: _TfidfQuery, prepared: _TfidfQuery) -> float:
+        if rep.vector is not None and prepared.vector is not None:
+            return sparse_dot(rep.vector, prepared.vector)
+        d, q = rep.counts, prepared.counts
+        dot = sum(c * q[t] for t, c in d.items() if t in q)
+        c2 = PAIR_IDF ** 2
+        d_norm2 = c2 * rep.sq_norm + (1 - c2) * sum(c * c for t, c in d.items() if t in q)
+        q_norm2 = c2 * prepared.sq_norm + (1 - c2) * sum(c * c for t, c in q.items() if t in d)
+        return dot / math.sqrt(d_norm2 * q_norm2) if d_norm2 > 0 and q_norm2 > 0 else 0.0
+
+    def batch(self, docs: list, prepared: _TfidfQuery) -> np.ndarray:
+        """All docs at once with sparse matrix products; same values as score()."""
+        if not docs:
+            return np.zeros(0)
+        model = get_idf_model() if prepared.vector is not None else None
+        if model is not None and model.hashing:
+            def column(t):
+                return hash_term(t, model.n_features)
+        else:
+            vocab: dict[str, int] = {}
+
+            def column(t):
+                return vocab.setdefault(t, len(vocab))
+
+        q_rows = _count_rows([list(prepared.counts.elements())], column)
+        d_rows = _count_rows([_terms(d) for d in docs], column)
+        n_cols = model.n_features if model is not None and model.hashing else max(len(vocab), 1)
+        Q = sparse.csr_matrix(q_rows, shape=(1, n_cols), dtype=np.float64)
+        D = sparse.csr_matrix(d_rows, shape=(len(docs), n_cols), dtype=np.float64)
+
+        if model is not None:
+            if model.hashing:
+                idf = np.asarray(model.hashed_idf, dtype=np.float64)
+            else:
+                idf = np.full(n_cols, model.default_idf)
+                for t, col in vocab.items():
+                    idf[col] = model.idf.get(t, model.default_idf)
+            Q = Q.multiply(idf).tocsr()
+            D = D.multiply(idf).tocsr()
+            dot = (D @ Q.T).toarray().ravel()
+            norms = np.sqrt(np.asarray(D.multiply(D).sum(axis=1)).ravel()) * np.sqrt(Q.multiply(Q).sum())
+        else:
+            c2 = PAIR_IDF ** 2
+            q = Q.toarray().ravel()
+            dot = D @ q
+            D2 = D.multiply(D)
+            shared = D2 @ (q > 0)
+            d_norm2 = c2 * np.asarray(D2.sum(axis=1)).ravel() + (1 - c2) * shared
+            q_norm2 = c2 * (q ** 2).sum() + (1 - c2) * (D.sign() @ q ** 2)
+            norms = np.sqrt(d_norm2 * q_norm2)
+
+        out = np.zeros(len(docs))
+        np.divide(dot, norms, out=out, where=norms > 0)
+        return out
+
+
+class Bm25Engine(SimilarityEngine):
+    """Okapi BM25 of the doc for the query's terms, divided by the score a
+    doc saturating every query term would get, so results fall in [0, 1).
+
+    IDF and average length come from the artifact when present; otherwise
+    the two texts are the whole corpus.
+    """
+
+    name = "bm25"
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+
+    @staticmethod
+    def _idf(n_docs: float, df: float) -> float:
+        return math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+    def prepare(self, query):
+        model = get_idf_model()
+        counts, length = self.represent(query)
+        idf = {t: self._idf(model.n_docs, model.doc_freq(t)) for t in counts} if model is not None else None
+        avg_len = model.avg_len if model is not None and model.avg_len else None
+        return counts, length, idf, avg_len
+
+    def represent(self, doc) -> tuple[Counter, int]:
+        terms = _terms(doc)
+        return Counter(terms), len(terms)
+
+    def compare(self, rep, prepared) -> float:
+        counts, length = rep
+        q_counts, q_len, idf, avg_len = prepared
+        if not length or not q_counts:
+            return 0.0
+        length_norm = self.k1 * (1 - self.b + self.b * length / (avg_len or (length + q_len) / 2))
+        num = den = 0.0
+        for t, qtf in q_counts.items():
+            tf = counts.get(t, 0)
+            # Pair corpus: the query always has the term, the doc maybe
+            w = idf[t] if idf is not None else self._idf(2, 1 + (tf > 0))
+            num += qtf * w * tf * (self.k1 + 1) / (tf + length_norm)
+            den += qtf * w * (self.k1 + 1)
+        return num / den if den else 0.0
+
+
+class MinHashEngine(SimilarityEngine):
+    """Jaccard similarity of the two term sets, estimated from MinHash
+    signatures: fixed cost per comparison however long the texts are.
+    Scores run lower than cosine for the same pair.
+    """
+
+    name = "minhash"
+
+    def __init__(self, hasher: MinHasher | None = None):
+        self.hasher = hasher or MinHasher()
+
+    def prepare(self, query):
+        return self.hasher.signature(_terms(query))
+
+    def represent(self, doc):
+        return self.hasher.signature(_terms(doc))
+
+    def compare(self, rep, prepared) -> float:
+        return self.hasher.jaccard(rep, prepared)
+
+
+ENGINES = {engine.name: engine for engine in (TfidfEngine, Bm25Engine, MinHashEngine)}
+
+_engine: SimilarityEngine | None = None
+
+
+def get_similarity_engine() -> SimilarityEngine:
+    """The engine selected by SIMILARITY_BACKEND; raises ValueError for an unknown name."""
+    global _engine
+    if _engine is None:
+        if SIMILARITY_BACKEND not in ENGINES:
+            raise ValueError(f"Unknown SIMILARITY_BACKEND {SIMILARITY_BACKEND!r}; choose from {', '.join(ENGINES)}")
+        _engine = ENGINES[SIMILARITY_BACKEND]()
+        print(f"Similarity backend: {_engine.name}")
+    return _engine
+
+
+def similarity_version() -> str:
+    """Identifies what similarity scores depend on: the engine and its IDF artifact."""
+    model = get_idf_model()
+    return f"{get_similarity_engine().name}-{model.version if model else 'pair'}"
+
+
+def get_similarity(doc1, doc2, prepared2=None) -> float:
+    """Similarity of doc1 to doc2 (str or ResumeDocument) with the configured engine.
+
+    ``prepared2`` is the engine's prepare(doc2) when the caller already has it.
+    """
+    engine = get_similarity_engine()
+    if prepared2 is None:
+        prepared2 = engine.prepare(doc2)
+    return engine.score(doc1, prepared2)
+
+
+def batch_similarity(docs: list, query, prepared=None) -> np.ndarray:
+    """get_similarity of every doc to one query."""
+    engine = get_similarity_engine()
+    if prepared is None:
+        prepared = engine.prepare(query)
+    return engine.batch(docs, prepared)
@@ -1,147 +1,130 @@
 # backend/app/skills.py
 
-# Master skill list (100+ skills across roles)
-SKILLS = [
-    # Core languages
-    "python", "java", "c", "c++", "c#", "javascript", "typescript",
-    "go", "rust", "kotlin", "swift", "ruby", "php", "r",
-
-    # Frontend
-    "html", "css", "sass", "less", "tailwind", "bootstrap",
-    "react", "nextjs", "vue", "angular", "svelte", "jquery",
-
-    # Backend / APIs
-    "node", "express", "django", "flask", "spring", "fastapi",
-    "laravel", ".net", "asp.net", "graphql", "rest api",
-
-    # Databases
-    "mysql", "postgresql", "sqlite", "mongodb", "redis", "oracle",
-    "sql server", "firebase",
-
-    # Cloud / DevOps (Expanded)
-    "aws", "azure", "gcp", "google cloud", "amazon web services",
-    "docker", "kubernetes", "terraform", "ansible", "puppet", "chef",
-    "jenkins", "github actions", "gitlab ci", "circleci", "travis ci",
-    "prometheus", "grafana", "splunk", "elk stack", "datadog", "new relic",
-    "serverless", "lambda", "ec2", "s3", "fargate", "eks", "aks", "gke",
-
-    # Cybersecurity
-    "cybersecurity", "penetration testing", "network security", "information security",
-    "ethical hacking", "vulnerability assessment", "incident response",
-    "siem", "firewalls", "cryptography", "owasp", "burp suite", "metasploit",
-    "wireshark", "pci dss", "gdpr", "hipaa", "identity and access management", "iam",
-    "cissp", "ceh", "oscp",
-
-    # Blockchain / Web3
-    "blockchain", "solidity", "web3", "smart contracts", "ethereum", "bitcoin",
-    "hyperledger", "rust", "truffle", "hardhat", "ganache", "ipfs",
-    "defi", "nfts", "cryptography", "consensus algorithms",
-
-    # OS / scripting
-    "linux", "bash", "powershell", "shell scripting", "unix",
-
-    # Data / ML / AI
-    "machine learning", "deep learning", "nlp", "computer vision",
-    "data analysis", "pandas", "numpy", "scikit-learn",
-    "tensorflow", "pytorch", "keras", "opencv", "llm", "generative ai",
-    "hugging face", "transformers", "xgboost", "lightgbm",
-    "matplotlib", "seaborn", "plotly",
-
-    # BI / analytics
-    "tableau", "power bi", "excel", "looker", "qlik",
-
-    # Messaging / streaming
-    "kafka", "rabbitmq", "sqs", "sns", "kinesis",
-
-    # Mobile
-    "android", "ios", "flutter", "react native", "swiftui", "kotlin", "swift", "dart",
-
-    # Generic SWE / tools
-    "git", "github", "gitlab", "jira", "confluence", "agile", "scrum", "kanban",
-    "rest api", "graphql", "grpc", "microservices", "software architecture", "design patterns",
-]
-
-# Synonyms / alternate spellings mapped to canonical skills above
-SYNONYMS = {
-    "js": "javascript",
-    "ts": "typescript",
-    "nodejs": "node",
-    "node.js": "node",
-    "react.js": "react",
-    "reactjs": "react",
-    "vue.js": "vue",
-    "next.js": "nextjs",
-    "asp.net core": "asp.net",
-    "rest": "rest api",
-    "restful api": "rest api",
-
-    "ml": "machine learning",
-    "dl": "deep learning",
-    "cv": "computer vision",
-
-    "sqlserver": "sql server",
-    "ms sql": "sql server",
-
-    "amazon web services": "aws",
-    "amazon aws": "aws",
-    "microsoft azure": "azure",
-    "google cloud": "gcp",
-    "gcloud": "gcp",
-
-    "k8s": "kubernetes",
-
-    "ci cd": "ci/cd",
-    "ci-cd": "ci/cd",
-    "ci_cd": "ci/cd",
-    "gitlab-ci": "gitlab ci",
-    "jenkins ci": "jenkins",
-
-    "rn": "react native",
-    "expo": "react native",
-
-    "offensive security": "cybersecurity",
-    "pentesting": "penetration testing",
-    "pen testing": "penetration testing",
-
-    "hyper ledger": "hyperledger",
-    "web 3": "web3",
-}
-
-# Role → indicative keywords (used to guess role/category from JD)
-ROLE_KEYWORDS = {
-    "Frontend Developer": [
-        "frontend", "front-end", "ui developer", "react", "angular", "vue",
-        "html", "css", "javascript", "typescript", "spa"
-    ],
-    "Backend Developer": [
-        "backend", "back-end", "api developer", "microservices", "spring",
-        "django", "flask", "node", "express", "database"
-    ],
-    "Full-Stack Developer": [
-        "fullstack", "full-stack", "full stack", "frontend and backend",
-        "mern", "mean", "lamp"
-    ],
-    "Data Scientist / ML Engineer": [
-        "data scientist", "ml engineer", "machine learning", "deep learning",
-        "nlp", "computer vision", "analytics", "data analysis"
-    ],
-    "DevOps / Cloud Engineer": [
-        "devops", "cloud engineer", "site reliability", "sre",
-        "kubernetes", "docker", "terraform", "ci/cd", "infrastructure"
-    ],
-    "Cybersecurity Engineer": [
-        "security engineer", "cybersecurity", "penetration testing",
-        "pen tester", "infosec", "appsec", "network security"
-    ],
-    "Blockchain Developer": [
-        "blockchain", "solidity", "web3", "smart contract", "defi"
-    ],
-    "Mobile Developer": [
-        "android", "ios", "mobile app", "flutter", "react native", "swiftui"
-    ],
-    "Software Engineer": [
-        "software engineer", "software developer", "sde", "swe",
-        "backend", "frontend", "fullstack"
-    ],
-}
-
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from types import MappingProxyType
+from typing import Mapping
+
+# The taxonomy lives in a data file so it can be updated without a code change.
+#   skills:   {group name: [canonical skill, ...]}
+#   synonyms: {alternate spelling: canonical skill}
+#   roles:    {role name: [indicative JD keyword, ...]}  (used to guess role from JD)
+TAXONOMY_PATH = os.getenv(
+    "SKILLS_TAXONOMY_PATH",
+    str(Path(__file__).parent / "data" / "skills.json"),
+)
+# Seconds between checks of the file's mtime (0 disables hot reload)
+SKILLS_RELOAD_INTERVAL = float(os.getenv("SKILLS_RELOAD_INTERVAL", 30))
+
+
+@dataclass(frozen=True)
+class SkillTaxonomy:
+    """Validated, normalized view of the taxonomy file. Never mutated."""
+
+    version: str                          # short hash of the file contents
+    skills: tuple[str, ...]               # canonical skills, sorted; index = skill ID
+    skill_ids: Mapping[str, int]          # canonical skill -> ID
+    groups: Mapping[str, tuple[str, ...]]
+    synonyms: Mapping[str, str]           # alternate spelling -> canonical skill
+    roles: Mapping[str, tuple[str, ...]]
+
+
+def _norm(term) -> str:
+    if not isinstance(term, str) or not term.strip():
+        raise ValueError(f"Invalid taxonomy term: {term!r}")
+    return " ".join(term.lower().split())
+
+
+def build_taxonomy(data: dict, version: str = "") -> SkillTaxonomy:
+    """Validate and normalize raw taxonomy data.
+
+    Terms are lowercased and whitespace-collapsed, duplicate skills are
+    dropped, and a term listed both as a skill and as a synonym is kept only as
+    a synonym so every mention resolves to a single canonical skill.
+    """
+    raw_groups = data.get("skills")
+    if not isinstance(raw_groups, dict) or not raw_groups:
+        raise ValueError("Taxonomy needs a non-empty 'skills' mapping of group -> list")
+
+    synonyms: dict[str, str] = {}
+    for syn, real in (data.get("synonyms") or {}).items():
+        synonyms[_norm(syn)] = _norm(real)
+
+    groups: dict[str, tuple[str, ...]] = {}
+    seen: set[str] = set()
+    for group, terms in raw_groups.items():
+        if not isinstance(terms, list):
+            raise ValueError(f"Skill group {group!r} must be a list")
+        kept = []
+        for term in map(_norm, terms):
+            if term in seen or term in synonyms:
+                continue
+            seen.add(term)
+            kept.append(term)
+        groups[group] = tuple(kept)
+
+    for syn, real in synonyms.items():
+        if real not in seen:
+            raise ValueError(f"Synonym {syn!r} points at unknown skill {real!r}")
+
+    roles = {
+        role: tuple(dict.fromkeys(map(_norm, keywords)))
+        for role, keywords in (data.get("roles") or {}).items()
+    }
+
+    skills = tuple(sorted(seen))
+    return SkillTaxonomy(
+        version=version,
+        skills=skills,
+        skill_ids=MappingProxyType({s: i for i, s in enumerate(skills)}),
+        groups=MappingProxyType(groups),
+        synonyms=MappingProxyType(synonyms),
+        roles=MappingProxyType(roles),
+    )
+
+
+def load_taxonomy(path: str | None = None) -> SkillTaxonomy:
+    raw = Path(path or TAXONOMY_PATH).read_bytes()
+    return build_taxonomy(json.loads(raw), version=hashlib.sha256(raw).hexdigest()[:12])
+
+
+_taxonomy = load_taxonomy()
+_taxonomy_mtime = os.path.getmtime(TAXONOMY_PATH)
+_next_check = time.monotonic() + SKILLS_RELOAD_INTERVAL
+_reload_lock = threading.Lock()
+
+
+def reload_taxonomy(path: str | None = None) -> SkillTaxonomy:
+    """Swap in a freshly loaded taxonomy. On a bad file the current one stays."""
+    global _taxonomy, _taxonomy_mtime
+    path = path or TAXONOMY_PATH
+    with _reload_lock:
+        try:
+            mtime = os.path.getmtime(path)
+            new = load_taxonomy(path)
+        except (OSError, ValueError) as e:
+            print(f"Skill taxonomy reload failed, keeping {_taxonomy.version}: {e}")
+            return _taxonomy
+        if new.version != _taxonomy.version:
+            print(f"Skill taxonomy reloaded: {_taxonomy.version} -> {new.version}")
+        _taxonomy, _taxonomy_mtime = new, mtime
+        return _taxonomy
+
+
+def get_taxonomy() -> SkillTaxonomy:
+    """Current taxonomy; picks up edits to the data file every SKILLS_RELOAD_INTERVAL seconds."""
+    global _next_check
+    if SKILLS_RELOAD_INTERVAL > 0 and time.monotonic() >= _next_check:
+        _next_check = time.monotonic() + SKILLS_RELOAD_INTERVAL
+        try:
+            changed = os.path.getmtime(TAXONOMY_PATH) != _taxonomy_mtime
+        except OSError:
+            changed = False
+        if changed:
+            reload_taxonomy()
+    return _taxonomy
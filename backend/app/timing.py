@@ -0,0 +1,205 @@
+# backend/app/timing.py
+
+import contextvars
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+# Time every request, not only those sending the X-Timing header
+SERVER_TIMING = os.getenv("SERVER_TIMING", "0").lower() in ("1", "true", "yes")
+# Request header that turns timing on for one request
+TIMING_HEADER = b"x-timing"
+
+# Histogram bucket upper bounds (ms); the last bucket is open-ended
+BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+# Stage name -> accumulated ms for the current request; None when not timing
+_current: contextvars.ContextVar[dict | None] = contextvars.ContextVar("stage_timings", default=None)
+
+
+def active() -> bool:
+    return _current.get() is not None
+
+
+@contextmanager
+def stage(name: str):
+    """Time the enclosed block as ``name`` when the current request is timed.
+
+    Repeated stages within one request add up.
+    """
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+
+class Laps:
+    """Stages of one straight-line function: each mark() closes the stage
+    that began at the previous mark (or at creation)."""
+
+    def __init__(self):
+        self._timings = _current.get()
+        self._last = time.perf_counter()
+
+    def mark(self, name: str):
+        if self._timings is None:
+            return
+        now = time.perf_counter()
+        self._timings[name] = self._timings.get(name, 0.0) + (now - self._last) * 1000
+        self._last = now
+
+
+def merge(timings: dict | None):
+    """Fold timings recorded elsewhere (a worker process) into the current request."""
+    current = _current.get()
+    if current is None or not timings:
+        return
+    for name, ms in timings.items():
+        current[name] = current.get(name, 0.0) + ms
+
+
+def call_timed(func, *args):
+    """Run func with its own recorder and return (result, timings).
+
+    Used where the work runs in another process or an executor thread that
+    does not inherit the request's context.
+    """
+    token = _current.set({})
+    try:
+        result = func(*args)
+        return result, _current.get()
+    finally:
+        _current.reset(token)
+
+
+class _Histogram:
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum_ms = 0.0
+
+    def observe(self, ms: float):
+        i = 0
+        while i < len(BUCKETS_MS) and ms > BUCKETS_MS[i]:
+            i += 1
+        self.counts[i] += 1
+        self.count += 1
+        self.sum_ms += ms
+
+    def summary(self) -> dict:
+        bounds = [str(b) for b in BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "sum_ms": round(self.sum_ms, 2),
+            "avg_ms": round(self.sum_ms / self.count, 2) if self.count else 0.0,
+            # Cumulative counts per upper bound, Prometheus style
+            "buckets": dict(zip(bounds, _cumulative(self.counts))),
+        }
+
+
+def _cumulative(counts: list[int]) -> list[int]:
+    total, out = 0, []
+    for c in counts:
+        total += c
+        out.append(total)
+    return out
+
+
+_histograms: dict[str, _Histogram] = {}
+_lock = threading.Lock()
+
+
+def observe(timings: dict):
+    with _lock:
+        for name, ms in timings.items():
+            _histograms.setdefault(name, _Histogram()).observe(ms)
+
+
+def timing_stats() -> dict:
+    with _lock:
+        return {name: h.summary() for name, h in sorted(_histograms.items())}
+
+
+# Event name -> times seen in this process (e.g. degraded fallbacks), for /metrics
+_counts: dict[str, int] = {}
+# Set while running a job for another process; its counts are returned to it
+_job_counts: contextvars.ContextVar[dict | None] = contextvars.ContextVar("event_counts", default=None)
+
+
+def count(name: str, n: int = 1):
+    """Count an event that should show up in /metrics rather than only in the log."""
+    pending = _job_counts.get()
+    if pending is not None:
+        pending[name] = pending.get(name, 0) + n
+        return
+    with _lock:
+        _counts[name] = _counts.get(name, 0) + n
+
+
+def merge_counts(counts: dict | None):
+    """Add events counted elsewhere (a worker process) to this process's totals."""
+    for name, n in (counts or {}).items():
+        count(name, n)
+
+
+def call_counted(func, *args):
+    """Run func and return (result, event counts); the process-pool
+    counterpart of call_timed for count()."""
+    token = _job_counts.set({})
+    try:
+        result = func(*args)
+        return result, _job_counts.get()
+    finally:
+        _job_counts.reset(token)
+
+
+def event_counts() -> dict:
+    with _lock:
+        return dict(sorted(_counts.items()))
+
+
+def header_value(timings: dict) -> str:
+    return ", ".join(f"{name};dur={ms:.2f}" for name, ms in timings.items())
+
+
+class TimingMiddleware:
+    """Record per-stage timings for a request and report them.
+
+    Enabled per request by the X-Timing header, or for every request with
+    SERVER_TIMING=1. Stages measured before the response starts are returned
+    in a Server-Timing header (plus a "total"), and every timed request feeds
+    the histograms shown in /metrics.
+    """
+
+    def __init__(self, app, always: bool = SERVER_TIMING):
+        self.app = app
+        self.always = always
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not (self.always or TIMING_HEADER in dict(scope["headers"])):
+            return await self.app(scope, receive, send)
+
+        timings: dict[str, float] = {}
+        token = _current.set(timings)
+        started = time.perf_counter()
+
+        async def timed_send(message):
+            if message["type"] == "http.response.start":
+                reported = dict(timings, total=(time.perf_counter() - started) * 1000)
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", header_value(reported).encode("latin-1")))
+                message = dict(message, headers=headers)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timed_send)
+        finally:
+            _current.reset(token)
+            timings["total"] = (time.perf_counter() - started) * 1000
+            observe(timings)
@@ -0,0 +1,148 @@
+# backend/app/uploads.py
+
+import os
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+
+# Size caps, enforced while the body is still being received
+MAX_RESUME_BYTES = int(os.getenv("MAX_RESUME_BYTES", 10 * 1024 * 1024))
+MAX_AVATAR_BYTES = int(os.getenv("MAX_AVATAR_BYTES", 2 * 1024 * 1024))
+MAX_BULK_UPLOAD_BYTES = int(os.getenv("MAX_BULK_UPLOAD_BYTES", 100 * 1024 * 1024))
+
+CHUNK_SIZE = 64 * 1024
+# Room for multipart boundaries and headers on top of the file itself
+_MULTIPART_OVERHEAD = 16 * 1024
+
+# Request body limits per upload route
+UPLOAD_LIMITS = {
+    "/upload-resume": MAX_RESUME_BYTES + _MULTIPART_OVERHEAD,
+    "/auth/upload-avatar": MAX_AVATAR_BYTES + _MULTIPART_OVERHEAD,
+    "/bulk-upload-resumes": MAX_BULK_UPLOAD_BYTES,
+}
+
+_IMAGE_MAGIC = {
+    b"\x89PNG\r\n\x1a\n": ".png",
+    b"\xff\xd8\xff": ".jpg",
+    b"GIF87a": ".gif",
+    b"GIF89a": ".gif",
+}
+
+
+class _BodyTooLarge(HTTPException):
+    # An HTTPException so FastAPI's body parsing lets it through as a 413
+    def __init__(self):
+        super().__init__(status_code=413, detail="Upload too large")
+
+
+class UploadLimitMiddleware:
+    """Reject oversized upload bodies with 413 before they are fully received.
+
+    A declared Content-Length over the limit is refused without reading
+    anything; otherwise bytes are counted as they arrive (chunked uploads).
+    """
+
+    def __init__(self, app, limits: dict[str, int] = UPLOAD_LIMITS):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope.get("path")) if scope["type"] == "http" else None
+        if limit is None:
+            return await self.app(scope, receive, send)
+
+        too_large = JSONResponse(status_code=413, content={"detail": "Upload too large"})
+        headers = dict(scope["headers"])
+        declared = headers.get(b"content-length")
+        if declared and declared.isdigit() and int(declared) > limit:
+            return await too_large(scope, receive, send)
+
+        received = 0
+        started = False
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _BodyTooLarge()
+            return message
+
+        async def tracking_send(message):
+            nonlocal started
+            if message["type"] == "http.response.start":
+                started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except _BodyTooLarge:
+            if not started:
+                await too_large(scope, receive, send)
+
+
+def is_pdf(head: bytes) -> bool:
+    # The spec lets "%PDF-" appear anywhere in the first 1024 bytes
+    return b"%PDF-" in head[:1024]
+
+
+def image_extension(head: bytes) -> str | None:
+    for magic, ext in _IMAGE_MAGIC.items():
+        if head.startswith(magic):
+            return ext
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ".webp"
+    return None
+
+
+async def _read_chunks(file: UploadFile, max_bytes: int):
+    """Yield the upload in chunks, failing with 413 once it passes max_bytes."""
+    total = 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            return
+        total += len(chunk)
+        if total > max_bytes:
+            raise HTTPException(status_code=413, detail=f"File exceeds {max_bytes // (1024 * 1024)} MB limit")
+        yield chunk
+
+
+async def read_pdf_upload(file: UploadFile, max_bytes: int = MAX_RESUME_BYTES) -> bytes:
+    """Read a PDF upload in chunks, checking its magic bytes before anything else."""
+    chunks = []
+    async for chunk in _read_chunks(file, max_bytes):
+        if not chunks and not is_pdf(chunk):
+            raise HTTPException(status_code=415, detail="Only PDF files are supported")
+        chunks.append(chunk)
+    if not chunks:
+        raise HTTPException(status_code=400, detail="Empty file")
+    return b"".join(chunks)
+
+
+async def save_image_upload(file: UploadFile, path_without_ext: str, max_bytes: int = MAX_AVATAR_BYTES) -> str:
+    """Stream an image upload to disk; returns the path written (extension from magic bytes)."""
+    path = None
+    tmp = None
+    f = None
+    try:
+        async for chunk in _read_chunks(file, max_bytes):
+            if f is None:
+                ext = image_extension(chunk)
+                if not ext:
+                    raise HTTPException(status_code=415, detail="Only PNG, JPEG, GIF or WebP images are supported")
+                path = path_without_ext + ext
+                tmp = path + ".part"
+                f = open(tmp, "wb")
+            f.write(chunk)
+        if f is None:
+            raise HTTPException(status_code=400, detail="Empty file")
+        f.close()
+        os.replace(tmp, path)
+        return path
+    finally:
+        if f is not None and not f.closed:
+            f.close()
+        if tmp and os.path.exists(tmp):
+            os.unlink(tmp)
@@ -0,0 +1,126 @@
+# backend/app/workers.py
+
+import asyncio
+import os
+
+from fastapi import HTTPException
+
+from .cache import parse_cache
+from .parser import parse_resume
+from .sandbox import JobError, SandboxError, SandboxPool
+
+# Number of parse processes (0 = parse in a thread of the API process, no sandbox)
+PARSE_WORKERS = int(os.getenv("PARSE_WORKERS", 2))
+# How many uploads may wait for a free worker before we start rejecting
+PARSE_QUEUE_SIZE = int(os.getenv("PARSE_QUEUE_SIZE", 8))
+# Times a batch item waits and retries while the pool is saturated
+BULK_BUSY_RETRIES = int(os.getenv("BULK_BUSY_RETRIES", 10))
+
+# Workers are spawned on first use so importing the app stays cheap
+_parse_pool = SandboxPool(PARSE_WORKERS) if PARSE_WORKERS > 0 else None
+_parse_inflight = 0
+
+
+def shutdown_parse_pool():
+    if _parse_pool is not None:
+        _parse_pool.shutdown()
+
+
+def parse_pool_stats() -> dict:
+    stats = _parse_pool.stats() if _parse_pool is not None else {"workers": 0}
+    stats["in_flight"] = _parse_inflight
+    stats["queue_size"] = PARSE_QUEUE_SIZE
+    return stats
+
+
+async def _run_sandboxed(job: str, func, content: bytes):
+    """Run a parser entry point in the sandbox (or a thread when PARSE_WORKERS=0)."""
+    if _parse_pool is None:
+        return await asyncio.to_thread(func, content)
+    try:
+        return await _parse_pool.run(job, content)
+    except SandboxError as e:
+        raise HTTPException(status_code=422, detail=f"Could not process this PDF: {e}")
+    except JobError as e:
+        raise ValueError(str(e))
+
+
+async def run_parse(content: bytes) -> dict:
+    """Run parse_resume off the event loop, rejecting fast when saturated.
+
+    Results are cached by content hash, so re-uploads skip the pool entirely.
+    """
+    global _parse_inflight
+    cache_key = parse_cache.key(content)
+    cached = parse_cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    if _parse_inflight >= max(PARSE_WORKERS, 1) + PARSE_QUEUE_SIZE:
+        raise HTTPException(
+            status_code=503,
+            detail="Resume parser is busy, please retry shortly",
+            headers={"Retry-After": "2"},
+        )
+
+    _parse_inflight += 1
+    try:
+        parsed = await _run_sandboxed("parse_resume", parse_resume, content)
+    finally:
+        _parse_inflight -= 1
+
+    parse_cache.put(cache_key, parsed)
+    return parsed
+
+
+async def _parse_item(filename: str, content: bytes) -> dict:
+    """Parse one file of a batch, turning failures into a per-file error."""
+    for attempt in range(BULK_BUSY_RETRIES + 1):
+        try:
+            return {"filename": filename, "parsed": await run_parse(content)}
+        except HTTPException as e:
+            if e.status_code != 503 or attempt == BULK_BUSY_RETRIES:
+                return {"filename": filename, "error": e.detail}
+            # Pool is saturated by other traffic; back off instead of failing the file
+            await asyncio.sleep(0.5 * (attempt + 1))
+        except Exception as e:
+            return {"filename": filename, "error": f"Failed to parse resume: {e}"}
+
+
+async def parse_many(items):
+    """Parse an async stream of (filename, content) and yield results as they finish.
+
+    ``content`` may be an Exception for a file that could not be read; it is
+    reported as that file's error without touching the pool.
+
+    Only a small window of files is read and in flight at once, so memory
+    stays flat however many files the batch holds.
+    """
+    window = max(PARSE_WORKERS, 1) * 2
+    items = items.__aiter__()
+    pending = set()
+    exhausted = False
+
+    try:
+        while True:
+            while not exhausted and len(pending) < window:
+                try:
+                    filename, content = await items.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                if isinstance(content, Exception):
+                    # The file could not even be read (bad zip member, too large, ...)
+                    yield {"filename": filename, "error": str(content)}
+                    continue
+                pending.add(asyncio.ensure_future(_parse_item(filename, content)))
+
+            if not pending:
+                return
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+    finally:
+        # Client went away mid-stream: free the sandbox slots held for it
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,46 @@
+"""
+Benchmark for the job-matching index.
+Indexes N synthetic JDs and reports /jobs/match query latency (p50 / p95 / max)
+for synthetic resumes, plus index build time.
+
+Usage: python bench_jobs.py [N]      (default: 100000)
+"""
+import random
+import sys
+import time
+
+from app.jobindex import JobIndex
+from app.skills import get_taxonomy
+
+SKILLS = get_taxonomy().skills
+FILLER = (
+    "we are looking for an engineer to join our team and build reliable services "
+    "you will own features end to end work with product and mentor others"
+).split()
+
+
+def make_text(rng: random.Random, words: int, skill_rate: float) -> str:
+    return " ".join(rng.choice(SKILLS) if rng.random() < skill_rate else rng.choice(FILLER) for _ in range(words))
+
+
+def main(n: int, queries: int = 200):
+    rng = random.Random(42)
+    index = JobIndex()
+    start = time.perf_counter()
+    for job_id in range(n):
+        index.add(job_id, make_text(rng, rng.randint(80, 400), 0.06), f"Job {job_id}")
+    print(f"indexed {len(index)} JDs in {time.perf_counter() - start:.1f} s  {index.stats()}")
+
+    timings = []
+    for _ in range(queries):
+        resume = make_text(rng, rng.randint(300, 900), 0.04)
+        start = time.perf_counter()
+        index.query(resume, top_k=10)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    print(f"query ms   p50 {timings[len(timings) // 2]:.1f}   p95 {timings[int(len(timings) * 0.95)]:.1f}   "
+          f"max {timings[-1]:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
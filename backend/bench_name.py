@@ -0,0 +1,43 @@
+"""
+Memory / latency check for the NAME_EXTRACTION modes.
+Each mode runs in a fresh interpreter so peak RSS is not shared between modes.
+
+Usage: python bench_name.py [resume.pdf]
+"""
+import json
+import subprocess
+import sys
+
+CHILD = r"""
+import json, resource, sys, time
+from app.parser import _pdf_bytes_to_text, extract_name
+
+mode, path = sys.argv[1], sys.argv[2]
+text = _pdf_bytes_to_text(open(path, "rb").read())
+headerless = "\n".join(text.splitlines()[3:])  # forces the NER path in auto mode
+
+start = time.perf_counter()
+name = extract_name(text, mode=mode)
+first_ms = (time.perf_counter() - start) * 1000
+
+runs = 50
+start = time.perf_counter()
+for _ in range(runs):
+    extract_name(text, mode=mode)
+    extract_name(headerless, mode=mode)
+avg_ms = (time.perf_counter() - start) / (runs * 2) * 1000
+
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"mode": mode, "name": name, "first_ms": first_ms, "avg_ms": avg_ms, "rss_mb": rss_mb}))
+"""
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "uploaded_resume.pdf"
+    print(f"{'mode':<6} {'peak RSS MB':>12} {'first call ms':>14} {'avg ms':>8}  name")
+    for mode in ("rules", "auto", "spacy"):
+        proc = subprocess.run([sys.executable, "-c", CHILD, mode, path], capture_output=True, text=True)
+        if proc.returncode != 0:
+            print(f"{mode:<6} failed: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        r = json.loads(proc.stdout.strip().splitlines()[-1])
+        print(f"{r['mode']:<6} {r['rss_mb']:>12.1f} {r['first_ms']:>14.1f} {r['avg_ms']:>8.2f}  {r['name']}")
@@ -0,0 +1,50 @@
+"""
+Benchmark for rank_resumes.
+Scores N synthetic resumes against one JD with a compute_score loop and with
+the batch ranker, and checks both produce the same breakdowns.
+
+Usage: python bench_rank.py [N ...]      (default: 100 500 2000)
+"""
+import random
+import sys
+import time
+
+from app.parser import ResumeDocument
+from app.scoring import compute_score, rank_resumes
+from app.skills import get_taxonomy
+
+SKILLS = get_taxonomy().skills
+FILLER = (
+    "led a team of engineers to deliver projects on time and improved "
+    "reliability across services while mentoring juniors and owning releases"
+).split()
+
+
+def make_text(rng: random.Random, words: int) -> str:
+    return " ".join(rng.choice(SKILLS) if rng.random() < 0.15 else rng.choice(FILLER) for _ in range(words))
+
+
+def main(sizes):
+    rng = random.Random(42)
+    jd = make_text(rng, 250)
+    for n in sizes:
+        texts = [make_text(rng, rng.randint(200, 900)) for _ in range(n)]
+
+        # Fresh documents each run so neither side reuses cached skills
+        docs = [ResumeDocument(t) for t in texts]
+        start = time.perf_counter()
+        loop = [compute_score(d, jd) for d in docs]
+        loop_s = time.perf_counter() - start
+
+        docs = [ResumeDocument(t) for t in texts]
+        start = time.perf_counter()
+        ranked = rank_resumes(docs, jd, top_k=n)
+        batch_s = time.perf_counter() - start
+
+        mismatches = sum(1 for i, result in ranked if result != loop[i])
+        print(f"{n:>5} resumes   loop {loop_s * 1000:8.1f} ms   batch {batch_s * 1000:8.1f} ms   "
+              f"x{loop_s / batch_s:5.1f}   mismatches {mismatches}")
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]] or [100, 500, 2000])
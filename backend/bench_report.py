@@ -0,0 +1,57 @@
+"""
+Benchmark for _generate_pdf_buffer.
+Renders a short (one page) and a long (AI-enriched, several pages) report
+repeatedly and prints reports per second and output size.
+
+Usage: python bench_report.py [seconds per case]      (default: 3)
+"""
+import sys
+import time
+
+from app.main import _generate_pdf_buffer
+
+SHORT = {
+    "final_score": 72.5,
+    "skill_score": 55.0,
+    "jd_similarity_score": 17.5,
+    "role": "Backend Engineer",
+    "user_name": "Jane Smith",
+    "matched_jd_skills": ["python", "docker", "aws", "postgresql", "fastapi"],
+    "missing_skills": ["kubernetes", "terraform"],
+    "resume_extra_skills": ["react", "graphql"],
+}
+
+LONG = dict(
+    SHORT,
+    matched_jd_skills=[f"skill {i}" for i in range(30)],
+    missing_skills=[f"gap {i}" for i in range(25)],
+    resume_extra_skills=[f"extra {i}" for i in range(25)],
+    improved_summary="Backend engineer with seven years of experience designing and operating "
+                     "high-throughput Python services on AWS, " * 4,
+    bullet_suggestions=[
+        {
+            "bullet": f"Cut p95 latency of the billing API by {10 + i}% by moving report rendering "
+                      "to a worker pool and caching derived features across requests",
+            "why": "Quantified impact on a metric the JD calls out, using the tools it lists",
+        }
+        for i in range(12)
+    ],
+)
+
+
+def bench(name: str, result: dict, seconds: float):
+    _generate_pdf_buffer(result)  # warm up fonts and imports
+    count, size = 0, 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < seconds:
+        size = len(_generate_pdf_buffer(result).getvalue())
+        count += 1
+    elapsed = time.perf_counter() - start
+    print(f"{name:<6} {count / elapsed:8.1f} reports/s   {elapsed / count * 1000:7.2f} ms/report   "
+          f"{size / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 3.0
+    bench("short", SHORT, seconds)
+    bench("long", LONG, seconds)
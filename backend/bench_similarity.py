@@ -0,0 +1,96 @@
+"""
+Compare the similarity backends (SIMILARITY_BACKEND) on a fixed corpus.
+Each backend runs in a fresh interpreter so peak RSS is not shared. Reports
+latency per resume (one by one and batched), peak RSS, and agreement with
+tfidf (Spearman rank correlation, top-10 overlap). When scikit-learn is
+installed, the original per-request TfidfVectorizer fit is included as a
+reference row.
+
+Usage: python bench_similarity.py [jd.txt resumes_dir]
+       (default: 300 synthetic resumes, seed 42)
+"""
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+
+CHILD = r"""
+import json, random, resource, sys, time
+from pathlib import Path
+
+backend, jd_path, resume_dir = sys.argv[1], sys.argv[2], sys.argv[3]
+if jd_path:
+    jd = Path(jd_path).read_text(encoding="utf-8", errors="ignore")
+    resumes = [p.read_text(encoding="utf-8", errors="ignore") for p in sorted(Path(resume_dir).glob("*.txt"))]
+else:
+    from app.skills import get_taxonomy
+    rng = random.Random(42)
+    skills = get_taxonomy().skills
+    filler = ("led a team of engineers to deliver projects on time and improved reliability across "
+              "services while mentoring juniors owning releases designing data pipelines").split()
+    def make(n):
+        return " ".join(rng.choice(skills) if rng.random() < 0.15 else rng.choice(filler) for _ in range(n))
+    jd = make(250)
+    resumes = [make(rng.randint(200, 3000)) for _ in range(300)]
+
+if backend == "sklearn":
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.metrics.pairwise import cosine_similarity
+
+    def one(text):
+        tfidf = TfidfVectorizer(stop_words="english").fit_transform([text, jd])
+        return float(cosine_similarity(tfidf[0:1], tfidf[1:2])[0][0])
+
+    start = time.perf_counter()
+    scores = [one(r) for r in resumes]
+    single_ms = (time.perf_counter() - start) / len(resumes) * 1000
+    batch_ms = None
+else:
+    from app.similarity import get_similarity_engine
+    engine = get_similarity_engine()
+    prepared = engine.prepare(jd)
+    start = time.perf_counter()
+    scores = [engine.score(r, prepared) for r in resumes]
+    single_ms = (time.perf_counter() - start) / len(resumes) * 1000
+    start = time.perf_counter()
+    engine.batch(resumes, prepared)
+    batch_ms = (time.perf_counter() - start) / len(resumes) * 1000
+
+rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+print(json.dumps({"single_ms": single_ms, "batch_ms": batch_ms, "rss_mb": rss_mb,
+                  "sklearn_loaded": "sklearn" in sys.modules, "scores": scores}))
+"""
+
+
+def spearman(a, b) -> float:
+    ra = np.argsort(np.argsort(a))
+    rb = np.argsort(np.argsort(b))
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def top_overlap(a, b, k: int = 10) -> int:
+    return len(set(np.argsort(a)[-k:]) & set(np.argsort(b)[-k:]))
+
+
+if __name__ == "__main__":
+    jd_path, resume_dir = (sys.argv[1], sys.argv[2]) if len(sys.argv) > 2 else ("", "")
+    results = {}
+    for backend in ("tfidf", "bm25", "minhash", "sklearn"):
+        env = dict(os.environ, SIMILARITY_BACKEND=backend if backend != "sklearn" else "tfidf")
+        proc = subprocess.run([sys.executable, "-c", CHILD, backend, jd_path, resume_dir],
+                              capture_output=True, text=True, env=env)
+        if proc.returncode != 0:
+            print(f"{backend:<8} failed: {proc.stderr.strip().splitlines()[-1]}")
+            continue
+        results[backend] = json.loads(proc.stdout.strip().splitlines()[-1])
+
+    base = np.array(results["tfidf"]["scores"])
+    print(f"{'backend':<8} {'ms/resume':>10} {'batched':>8} {'peak RSS MB':>12} {'sklearn':>8} "
+          f"{'spearman':>9} {'top10':>6} {'max |diff|':>11}")
+    for backend, r in results.items():
+        scores = np.array(r["scores"])
+        batch = f"{r['batch_ms']:.3f}" if r["batch_ms"] is not None else "-"
+        print(f"{backend:<8} {r['single_ms']:>10.3f} {batch:>8} {r['rss_mb']:>12.1f} {str(r['sklearn_loaded']):>8} "
+              f"{spearman(base, scores):>9.3f} {top_overlap(base, scores):>6} {np.abs(base - scores).max():>11.2e}")
@@ -0,0 +1,82 @@
+"""
+Benchmark for extract_skills.
+Compares the old per-skill regex loop with the compiled single-pass matcher
+on synthetic resumes of 1-20 pages and checks both return the same skills.
+
+Usage: python bench_skills.py
+"""
+import random
+import re
+import time
+
+from app.parser import extract_skills
+from app.skills import get_taxonomy
+
+PAGE_CHARS = 3000  # roughly one dense resume page
+SKILLS = get_taxonomy().skills
+SYNONYMS = get_taxonomy().synonyms
+
+
+def legacy_extract_skills(text: str) -> list[str]:
+    """The original implementation: one re.search per skill / synonym."""
+    text_low = text.lower()
+    found = set()
+    for skill in sorted(SKILLS, key=len, reverse=True):
+        s_esc = re.escape(skill.lower())
+        pattern = r'(?:^|[\s,.\/;:\(\)\[\]])' + s_esc + r'(?:$|[\s,.\/;:\(\)\[\]])'
+        if re.search(pattern, text_low):
+            found.add(skill)
+    for syn, real in SYNONYMS.items():
+        s_esc = re.escape(syn)
+        pattern = r'(?:^|[\s,.\/;:\(\)\[\]])' + s_esc + r'(?:$|[\s,.\/;:\(\)\[\]])'
+        if re.search(pattern, text_low):
+            found.add(real)
+    return sorted(found)
+
+
+FILLER = (
+    "led a team of engineers to deliver projects on time and improved "
+    "reliability across services while mentoring juniors and owning releases"
+).split()
+SEPARATORS = [" ", " ", " ", ", ", ". ", "\n", "/", "(", ")", "-", "_", "+", ";"]
+
+
+def make_resume(pages: int, rng: random.Random) -> str:
+    terms = list(SKILLS) + list(SYNONYMS)
+    parts: list[str] = []
+    size = 0
+    while size < pages * PAGE_CHARS:
+        word = rng.choice(terms) if rng.random() < 0.15 else rng.choice(FILLER)
+        if rng.random() < 0.2:
+            word = word.upper() if rng.random() < 0.5 else word.title()
+        parts.append(word)
+        parts.append(rng.choice(SEPARATORS))
+        size += len(word) + 1
+    return "".join(parts)
+
+
+def check_equivalence(rng: random.Random, rounds: int = 300) -> None:
+    for _ in range(rounds):
+        text = make_resume(rng.randint(0, 2), rng)[: rng.randint(0, 4000)]
+        assert extract_skills(text) == legacy_extract_skills(text), text
+
+
+def bench(fn, text: str, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(text)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+if __name__ == "__main__":
+    rng = random.Random(42)
+    check_equivalence(rng)
+    print("Equivalence check passed.\n")
+
+    print(f"{'pages':>5} {'chars':>8} {'legacy ms':>10} {'compiled ms':>12} {'speedup':>8}")
+    for pages in (1, 2, 5, 10, 20):
+        text = make_resume(pages, rng)
+        repeat = max(3, 40 // pages)
+        old = bench(legacy_extract_skills, text, repeat)
+        new = bench(extract_skills, text, repeat)
+        print(f"{pages:>5} {len(text):>8} {old:>10.2f} {new:>12.2f} {old / new:>7.1f}x")
@@ -0,0 +1,42 @@
+"""
+Fit the IDF model used for JD/resume similarity.
+Reads every .txt and .pdf file under the corpus directories (JDs and resumes)
+and writes a compact JSON artifact that the API loads at startup.
+
+Usage:
+    python fit_idf.py corpus/jds corpus/resumes
+    python fit_idf.py corpus --hashing 65536      # fixed-size hashed IDF table
+    python fit_idf.py corpus --out app/data/idf_model.json --min-df 2
+"""
+import argparse
+from pathlib import Path
+
+from app.parser import _pdf_bytes_to_text
+from app.similarity import IDF_MODEL_PATH, IdfModel, tokenize
+
+
+def iter_documents(dirs):
+    for d in dirs:
+        for path in sorted(Path(d).rglob("*")):
+            if path.suffix.lower() == ".txt":
+                yield tokenize(path.read_text(encoding="utf-8", errors="ignore"))
+            elif path.suffix.lower() == ".pdf":
+                yield tokenize(_pdf_bytes_to_text(path.read_bytes()))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("corpus", nargs="+", help="directories with .txt / .pdf documents")
+    ap.add_argument("--out", default=IDF_MODEL_PATH)
+    ap.add_argument("--hashing", type=int, default=0, metavar="N_FEATURES",
+                    help="store idf per hash bucket instead of per term")
+    ap.add_argument("--min-df", type=int, default=1, help="drop terms seen in fewer documents")
+    args = ap.parse_args()
+
+    model = IdfModel.fit(iter_documents(args.corpus), n_features=args.hashing, min_df=args.min_df)
+    if not model.n_docs:
+        raise SystemExit("No .txt or .pdf documents found")
+    model.save(args.out)
+    size = Path(args.out).stat().st_size / 1024
+    terms = model.n_features if model.hashing else len(model.idf)
+    print(f"Fitted on {model.n_docs} documents, {terms} {'buckets' if model.hashing else 'terms'} -> {args.out} ({size:.0f} KB)")
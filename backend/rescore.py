@@ -0,0 +1,31 @@
+"""
+Recompute every stored analysis score after a taxonomy or scoring change.
+Runs the same resumable job as POST /admin/rescore in the foreground;
+interrupt it at any time and run it again to continue from the checkpoint.
+
+Usage: python rescore.py
+"""
+from app.database import SessionLocal, init_db
+from app.rescore import _threads, job_status, pause_rescore, start_rescore
+
+if __name__ == "__main__":
+    init_db()
+    db = SessionLocal()
+    try:
+        job = start_rescore(db)
+        thread = _threads[job.id]
+        while thread.is_alive():
+            thread.join(timeout=5)
+            db.refresh(job)
+            s = job_status(job)
+            print(f"job {s['id']}: {s['processed']}/{s['total']} ({s['progress']:.0%}), "
+                  f"{s['updated']} updated, {s['skipped']} skipped")
+        db.refresh(job)
+        print(job_status(job))
+    except KeyboardInterrupt:
+        pause_rescore(db, job.id)
+        print(f"Paused job {job.id}; run again to resume")
+    except ValueError as e:
+        raise SystemExit(str(e))
+    finally:
+        db.close()